@@ -0,0 +1,136 @@
+import argparse
+from difflib import SequenceMatcher
+
+from attorney_records import (AttorneyRecord, NDJSONSink, canonical_firm, canonical_website, iter_records,
+                              normalize_name, normalize_phone, specialty_tuple)
+
+# De-duplication of scraped attorney records.
+#
+# Listing pages repeat attorneys across pages and practice areas. Records
+# are matched in three passes, cheapest first:
+#
+#   1. exact name + phone (digits only)
+#   2. exact Justia profile URL (one page per attorney)
+#   3. fuzzy name within a block of the same state and last-name prefix,
+#      confirmed by a matching phone, firm or website
+#
+# Any other website can be shared by a whole firm or organization, so it
+# only confirms a fuzzy name match, like a phone or firm does.
+#
+# Only the block is compared in pass 3, so the work per record stays roughly
+# constant and a 100k-record crawl dedups in near-linear time. Kept records
+# are held as compact AttorneyRecords.
+#
+#   python attorney_dedup.py attorneys_us.ndjson --output attorneys_us.dedup.ndjson
+
+NAME_SIMILARITY = 0.88
+BLOCK_PREFIX = 3
+PROFILE_PREFIX = "lawyers.justia.com/lawyer/"  # Canonical per-attorney profile URLs
+
+def merge_into(kept, record):
+    """Folds a duplicate into the kept AttorneyRecord: union of specialties, gaps filled in."""
+    specialties = list(kept.specialties)
+    seen = set(specialties)
+    for specialty in record.get("specialties") or []:
+        if specialty not in seen:
+            specialties.append(specialty)
+            seen.add(specialty)
+    if len(specialties) != len(kept.specialties):
+        kept.specialties = specialty_tuple(specialties)
+    for field, value in record.items():
+        if field != "specialties" and kept.get(field) is None and value is not None:
+            kept.set(field, value)
+
+class DedupIndex:
+    """Accumulates unique records, merging duplicates as they are added."""
+
+    def __init__(self, similarity=NAME_SIMILARITY, prefix=BLOCK_PREFIX):
+        self.similarity = similarity
+        self.prefix = prefix
+        self.records = []
+        self.merged = 0
+        self._by_name_phone = {}
+        self._by_profile = {}
+        self._blocks = {}
+        self._features = []  # (name, phone, firm, website) per kept record
+
+    def _block_key(self, record, name):
+        last = name.rsplit(" ", 1)[-1] if name else ""
+        return (record.get("state") or "", last[:self.prefix])
+
+    def _find(self, record, name, phone, firm, website):
+        if phone and (name, phone) in self._by_name_phone:
+            return self._by_name_phone[(name, phone)]
+        if website.startswith(PROFILE_PREFIX) and website in self._by_profile:
+            return self._by_profile[website]
+
+        for idx in self._blocks.get(self._block_key(record, name), ()):
+            other_name, other_phone, other_firm, other_website = self._features[idx]
+            corroborated = ((phone and phone == other_phone) or (firm and firm == other_firm)
+                            or (website and website == other_website))
+            if not corroborated:
+                continue
+            if SequenceMatcher(None, name, other_name).ratio() >= self.similarity:
+                return idx
+        return None
+
+    def _register(self, idx, name, phone, website):
+        if phone:
+            self._by_name_phone.setdefault((name, phone), idx)
+        if website.startswith(PROFILE_PREFIX):
+            self._by_profile.setdefault(website, idx)
+
+    def add(self, record):
+        """Adds `record`, merging it into an existing one when it is a duplicate."""
+        name = normalize_name(record.get("name"))
+        phone = normalize_phone(record.get("phone"))
+        firm = canonical_firm(record.get("firm"))
+        website = canonical_website(record.get("website"))
+
+        idx = self._find(record, name, phone, firm, website)
+        if idx is not None:
+            merge_into(self.records[idx], record)
+            self.merged += 1
+            kept_name, kept_phone, kept_firm, kept_website = self._features[idx]
+            # The merged record may have gained a phone or website; index those too
+            self._features[idx] = (kept_name, kept_phone or phone, kept_firm or firm, kept_website or website)
+            self._register(idx, kept_name, phone, website)
+            return
+
+        idx = len(self.records)
+        kept = AttorneyRecord.from_dict(record)
+        kept.specialties = specialty_tuple(record.get("specialties") or [])
+        self.records.append(kept)
+        self._features.append((name, phone, firm, website))
+        self._blocks.setdefault(self._block_key(record, name), []).append(idx)
+        self._register(idx, name, phone, website)
+
+def dedup_records(records, similarity=NAME_SIMILARITY):
+    """Returns (unique_records, merged_count), the unique records as dicts."""
+    index = DedupIndex(similarity)
+    for record in records:
+        index.add(record)
+    return [record.to_dict() for record in index.records], index.merged
+
+def dedup_file(input_path, output_path, similarity=NAME_SIMILARITY):
+    index = DedupIndex(similarity)
+    for record in iter_records(input_path):
+        index.add(record)
+    with NDJSONSink(output_path) as sink:
+        sink.write_many(index.records)
+    return len(index.records), index.merged
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge duplicate attorney records from scraper output.")
+    parser.add_argument("input", help="Scraper output (NDJSON, .ndjson.gz, or legacy JSON array)")
+    parser.add_argument("--output", help="Defaults to replacing the input file")
+    parser.add_argument("--similarity", type=float, default=NAME_SIMILARITY,
+                        help="Minimum name similarity (0-1) for fuzzy matches within a block")
+    args = parser.parse_args()
+
+    output = args.output or args.input
+    kept, merged = dedup_file(args.input, output, args.similarity)
+    print(f"[+] {kept} unique attorneys ({merged} duplicates merged) saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+
+from attorney_records import NDJSONSink, iter_records, record_hash, record_key
+
+# Snapshot diff for scraper output.
+#
+# Keeps a small index of {record key: content hash} for the last snapshot and
+# emits only what changed since then, one NDJSON line per change:
+#
+#   {"op": "added",   "record": {...}}
+#   {"op": "changed", "record": {...}}
+#   {"op": "removed", "record": {"name": ..., "phone": ...}}
+#
+#   python attorney_diff.py attorneys_us.ndjson --output attorneys_changes.ndjson
+#
+# The index is replaced with the new snapshot's once the diff is written, so
+# the next run compares against this one.
+
+INDEX_FILE = "attorneys_index.json"
+CHANGES_FILE = "attorneys_changes.ndjson"
+
+def load_index(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_index(path, index):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def build_index(records):
+    """{key: hash} for a snapshot. The first record for a key wins, like ON CONFLICT DO NOTHING."""
+    index = {}
+    for record in records:
+        index.setdefault(record_key(record), record_hash(record))
+    return index
+
+def key_fields(key):
+    name, phone = key.split("\x1f")
+    return {"name": name or None, "phone": phone or None}
+
+def diff_snapshot(records, previous, current):
+    """Yields (op, record) changes between `records` and the `previous` index.
+
+    `current` is filled with the new snapshot's index as records stream past,
+    so nothing but the two indexes is held in memory.
+    """
+    for record in records:
+        key = record_key(record)
+        if key in current:
+            continue
+        digest = record_hash(record)
+        current[key] = digest
+
+        old = previous.get(key)
+        if old is None:
+            yield "added", record
+        elif old != digest:
+            yield "changed", record
+
+    for key in previous:
+        if key not in current:
+            yield "removed", key_fields(key)
+
+def main():
+    parser = argparse.ArgumentParser(description="Emit added/changed/removed attorney records between scrape snapshots.")
+    parser.add_argument("snapshot", help="Scraper output (NDJSON, .ndjson.gz, or legacy JSON array)")
+    parser.add_argument("--index", default=INDEX_FILE, help="Index of the previous snapshot; replaced on success")
+    parser.add_argument("--previous", help="Build the previous index from this snapshot instead of --index")
+    parser.add_argument("--output", default=CHANGES_FILE)
+    parser.add_argument("--dry-run", action="store_true", help="Write the changes but keep the old index")
+    args = parser.parse_args()
+
+    if args.previous:
+        previous = build_index(iter_records(args.previous))
+    else:
+        previous = load_index(args.index)
+    if not previous:
+        print(f"[*] No previous index at {args.index}; every record is new")
+
+    current = {}
+    stats = {"added": 0, "changed": 0, "removed": 0}
+    with NDJSONSink(args.output) as sink:
+        for op, record in diff_snapshot(iter_records(args.snapshot), previous, current):
+            stats[op] += 1
+            sink.write({"op": op, "record": record})
+
+    unchanged = len(current) - stats["added"] - stats["changed"]
+    print(f"[+] {stats['added']} added, {stats['changed']} changed, "
+          f"{stats['removed']} removed, {unchanged} unchanged -> {args.output}")
+
+    if not args.dry_run:
+        save_index(args.index, current)
+        print(f"[+] Index of {len(current)} records saved to {args.index}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import re
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # pragma: no cover - optional C backend
+    lxml = None
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional C backend
+    LexborHTMLParser = None
+
+# Parser backends for Justia listing pages.
+#
+# Every backend returns the same record dicts as parse_attorney() on the
+# html.parser tree; benchmarks/bench_parsers.py checks that against the
+# recorded pages in fixtures/justia/ and reports cards/sec per backend.
+#
+#   html.parser  BeautifulSoup over the whole document (the original path)
+#   strainer     BeautifulSoup building only the div.jcard subtrees
+#   lxml         lxml.html with XPath extraction inside each card
+#   selectolax   Lexbor CSS selectors inside each card
+#
+# CardStream is the incremental form of the lxml backend: it is fed the
+# response as it downloads and emits each card's record as soon as the
+# card's closing tag has arrived.
+
+# Note: Class names can change; inspect Justia source if this breaks.
+CARD_CLASS = 'jcard'
+
+def parse_attorney(card, state="South Carolina"):
+    """Extracts data from a single attorney card HTML element."""
+    try:
+        # Name
+        name_tag = card.find('strong', class_='name')
+        name = name_tag.get_text(strip=True) if name_tag else "Unknown"
+
+        # Firm
+        firm_tag = card.find('span', class_='law-firm-name')
+        firm = firm_tag.get_text(strip=True) if firm_tag else None
+
+        # Contact Info Block
+        phone_tag = card.find('a', class_=['phone', '-phone'])
+        phone = phone_tag.get_text(strip=True) if phone_tag else None
+
+        # Address (Often unstructured, grabbing snippet)
+        address_tag = card.find('span', class_='address')
+        address = address_tag.get_text(" ", strip=True) if address_tag else state
+
+        # Website / Profile Link
+        link_tag = name_tag.find_parent('a')
+        website = link_tag['href'] if link_tag else None
+
+        # Specialty tags (Grab secondary practice areas)
+        specialties = []
+        spec_block = card.find('div', class_='practices')
+        if spec_block:
+            specialties = [s.get_text(strip=True) for s in spec_block.find_all('a')]
+
+        return make_record(name, firm, phone, address, website, specialties, state)
+    except Exception as e:
+        print(f"[-] Error parsing card: {e}")
+        return None
+
+def make_record(name, firm, phone, address, website, specialties, state):
+    return {
+        "name": name,
+        "firm": firm,
+        "phone": phone,
+        "address": address,
+        "website": website,
+        "specialties": specialties,
+        "state": state,
+        "source": "Justia"
+    }
+
+def _parse_cards(cards, state):
+    records = []
+    for card in cards:
+        data = parse_attorney(card, state)
+        if data:
+            records.append(data)
+    return records
+
+# --- BEAUTIFULSOUP ---
+
+def parse_page_soup(html, state="South Carolina"):
+    soup = BeautifulSoup(html, 'html.parser')
+    return _parse_cards(soup.find_all('div', class_=CARD_CLASS), state)
+
+# Strainers see the raw class attribute ("jcard -lawyer ..."), so match the word
+_card_strainer = SoupStrainer('div', class_=re.compile(rf'(^|\s){CARD_CLASS}(\s|$)'))
+
+def parse_page_strainer(html, state="South Carolina"):
+    # Only the card subtrees are built; the rest of the page is skipped by the tokenizer
+    soup = BeautifulSoup(html, 'lxml' if lxml else 'html.parser', parse_only=_card_strainer)
+    return _parse_cards(soup.find_all('div', class_=CARD_CLASS), state)
+
+# --- LXML ---
+
+def _xpath_class(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+_X_CARDS = f"//div[{_xpath_class(CARD_CLASS)}]"
+_X_NAME = f".//strong[{_xpath_class('name')}]"
+_X_FIRM = f".//span[{_xpath_class('law-firm-name')}]"
+_X_PHONE = f".//a[{_xpath_class('phone')} or {_xpath_class('-phone')}]"
+_X_ADDRESS = f".//span[{_xpath_class('address')}]"
+_X_PRACTICES = f".//div[{_xpath_class('practices')}]"
+
+def _lxml_text(el, separator=""):
+    # Same as BeautifulSoup's get_text(separator, strip=True)
+    return separator.join(s.strip() for s in el.itertext() if s.strip())
+
+def _lxml_first(card, xpath):
+    found = card.xpath(xpath)
+    return found[0] if found else None
+
+def parse_card_lxml(card, state="South Carolina"):
+    """parse_attorney() for an lxml.html element."""
+    try:
+        name_tag = _lxml_first(card, _X_NAME)
+        if name_tag is None:
+            raise ValueError("card has no name tag")
+        name = _lxml_text(name_tag)
+
+        firm_tag = _lxml_first(card, _X_FIRM)
+        firm = _lxml_text(firm_tag) if firm_tag is not None else None
+
+        phone_tag = _lxml_first(card, _X_PHONE)
+        phone = _lxml_text(phone_tag) if phone_tag is not None else None
+
+        address_tag = _lxml_first(card, _X_ADDRESS)
+        address = _lxml_text(address_tag, " ") if address_tag is not None else state
+
+        link_tag = next(name_tag.iterancestors('a'), None)
+        website = link_tag.attrib['href'] if link_tag is not None else None
+
+        specialties = []
+        spec_block = _lxml_first(card, _X_PRACTICES)
+        if spec_block is not None:
+            specialties = [_lxml_text(a) for a in spec_block.iter('a')]
+
+        return make_record(name, firm, phone, address, website, specialties, state)
+    except Exception as e:
+        print(f"[-] Error parsing card: {e}")
+        return None
+
+def parse_page_lxml(html, state="South Carolina"):
+    doc = lxml.html.document_fromstring(html)
+    records = []
+    for card in doc.xpath(_X_CARDS):
+        data = parse_card_lxml(card, state)
+        if data:
+            records.append(data)
+    return records
+
+# --- STREAMING ---
+
+class CardStream:
+    """Push parser for one listing page, emitting records while the page downloads.
+
+    feed() takes raw response chunks; every div.jcard whose closing tag has
+    arrived is parsed with parse_card_lxml() and passed to `emit`. Finished
+    elements are cleared and unlinked as parsing goes, so the tree never
+    holds more than the open card and its ancestors, however long the page.
+    """
+
+    def __init__(self, state, emit, encoding="utf-8"):
+        self.state = state
+        self.emit = emit
+        self.cards = 0
+        self.records = 0
+        self.bytes = 0
+        self.parse_seconds = 0.0
+        self.first_record_at = None  # perf_counter() when the first record was emitted
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self._card = None
+
+    def feed(self, chunk):
+        start = time.perf_counter()
+        self.bytes += len(chunk)
+        self._parser.feed(chunk)
+        self._drain()
+        self.parse_seconds += time.perf_counter() - start
+
+    def close(self):
+        start = time.perf_counter()
+        self._parser.close()
+        self._drain()
+        self.parse_seconds += time.perf_counter() - start
+
+    def _drain(self):
+        for event, el in self._parser.read_events():
+            if event == "start":
+                if self._card is None and el.tag == "div" and CARD_CLASS in (el.get("class") or "").split():
+                    self._card = el
+                continue
+            if self._card is not None:
+                if el is not self._card:
+                    continue  # Part of the open card; kept until the card ends
+                self._card = None
+                self.cards += 1
+                record = parse_card_lxml(el, self.state)
+                if record:
+                    self.records += 1
+                    if self.first_record_at is None:
+                        self.first_record_at = time.perf_counter()
+                    self.emit(record)
+            # Done with this element: drop its content and any finished siblings before it
+            el.clear()
+            parent = el.getparent()
+            if parent is not None:
+                while el.getprevious() is not None:
+                    del parent[0]
+
+# --- SELECTOLAX ---
+
+def _lexbor_text(node, separator=""):
+    # Lexbor keeps whitespace-only text nodes as empty pieces; drop them like get_text(strip=True)
+    pieces = node.text(deep=True, separator="\x00", strip=True).split("\x00")
+    return separator.join(p for p in pieces if p)
+
+def parse_card_selectolax(card, state="South Carolina"):
+    """parse_attorney() for a selectolax (Lexbor) node."""
+    try:
+        name_tag = card.css_first('strong.name')
+        if name_tag is None:
+            raise ValueError("card has no name tag")
+        name = _lexbor_text(name_tag)
+
+        firm_tag = card.css_first('span.law-firm-name')
+        firm = _lexbor_text(firm_tag) if firm_tag is not None else None
+
+        phone_tag = card.css_first('a.phone, a.-phone')
+        phone = _lexbor_text(phone_tag) if phone_tag is not None else None
+
+        address_tag = card.css_first('span.address')
+        address = _lexbor_text(address_tag, " ") if address_tag is not None else state
+
+        link_tag = name_tag.parent
+        while link_tag is not None and link_tag.tag != 'a':
+            link_tag = link_tag.parent
+        website = link_tag.attributes['href'] if link_tag is not None else None
+
+        specialties = []
+        spec_block = card.css_first('div.practices')
+        if spec_block is not None:
+            specialties = [_lexbor_text(a) for a in spec_block.css('a')]
+
+        return make_record(name, firm, phone, address, website, specialties, state)
+    except Exception as e:
+        print(f"[-] Error parsing card: {e}")
+        return None
+
+def parse_page_selectolax(html, state="South Carolina"):
+    tree = LexborHTMLParser(html)
+    records = []
+    for card in tree.css(f'div.{CARD_CLASS}'):
+        data = parse_card_selectolax(card, state)
+        if data:
+            records.append(data)
+    return records
+
+# --- REGISTRY ---
+
+PARSER_BACKENDS = {"html.parser": parse_page_soup, "strainer": parse_page_strainer}
+if lxml:
+    PARSER_BACKENDS["lxml"] = parse_page_lxml
+if LexborHTMLParser:
+    PARSER_BACKENDS["selectolax"] = parse_page_selectolax
+
+DEFAULT_PARSER = "lxml" if lxml else "html.parser"
+
+def parse_page(html, state="South Carolina", parser=DEFAULT_PARSER):
+    """Returns the attorney records found on one listing page."""
+    return PARSER_BACKENDS[parser](html, state)
+
+# Counts card divs straight off the markup, whichever backend parses the page,
+# so crawl metrics can tell a page with no cards (a layout change) from cards
+# that failed to parse.
+_card_markup = re.compile(rf'<div\b[^>]*\bclass\s*=\s*["\'](?:[^"\']*\s)?{CARD_CLASS}["\'\s]', re.I)
+
+def count_cards(html):
+    return len(_card_markup.findall(html))
@@ -0,0 +1,263 @@
+import gzip
+import hashlib
+import json
+import re
+import sys
+from urllib.parse import urlsplit
+
+# Reading and writing scraped attorney records.
+#
+# The scraper streams records as NDJSON (one JSON object per line), optionally
+# gzip-compressed when the path ends in .gz. Older runs wrote a single JSON
+# array; iter_records() reads both so downstream stages don't need to care.
+
+RECORD_FIELDS = ("name", "firm", "phone", "address", "website", "specialties", "state", "source")
+
+def open_text(path, mode='r'):
+    """Opens `path` for text I/O, gzip-compressed when it ends in .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+class NDJSONSink:
+    """Appends records to an NDJSON file as they are parsed.
+
+    Serialized lines are buffered and written every `batch_size` records, or
+    whenever flush() is called, so readers can tail the file while a crawl is
+    still running. For a .gz path every flush writes a complete gzip member;
+    gzip readers treat the members as one stream, and a killed run never
+    leaves a half-finished member for a resumed run to append after.
+    """
+
+    def __init__(self, path, batch_size=100, append=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self.compress = path.endswith('.gz')
+        self._buffer = []
+        self._file = open(path, 'ab' if append else 'wb')
+
+    def write(self, record):
+        if isinstance(record, AttorneyRecord):
+            record = record.to_dict()
+        self._buffer.append(json.dumps(record, ensure_ascii=False))
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._buffer:
+            data = ("\n".join(self._buffer) + "\n").encode('utf-8')
+            self._file.write(gzip.compress(data) if self.compress else data)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_records(path):
+    """Yields records from scraper output, either NDJSON or a legacy JSON array."""
+    with open_text(path) as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+
+        if head == '[':
+            # Legacy json.dump output has to be loaded whole
+            yield from json.loads(head + f.read())
+            return
+
+        first_line = head + f.readline()
+        if first_line.strip():
+            yield json.loads(first_line)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# --- COMPACT RECORDS ---
+# A nationwide crawl repeats the same state, source and specialty strings in
+# every record, and each record dict carries its own hash table. AttorneyRecord
+# keeps the fields in slots, interns the repeated strings and shares one tuple
+# per distinct specialty list. It converts to and from the JSON shape without
+# loss: key order, missing keys and unknown keys all survive the round trip.
+
+_MISSING = object()
+_INTERNED_FIELDS = ("state", "source")
+_specialty_tuples = {}
+
+def specialty_tuple(specialties):
+    """Shared, interned tuple for a specialty list; equal lists return the same object."""
+    key = tuple(sys.intern(s) if isinstance(s, str) else s for s in specialties)
+    return _specialty_tuples.setdefault(key, key)
+
+class AttorneyRecord:
+    """Slotted attorney record with interned state/source/specialty strings."""
+
+    __slots__ = RECORD_FIELDS + ("extra", "order")
+
+    def __init__(self, **fields):
+        for field in RECORD_FIELDS:
+            setattr(self, field, _MISSING)
+        self.extra = None  # Keys outside RECORD_FIELDS, in a dict only when present
+        self.order = None  # Key order when it differs from RECORD_FIELDS
+        for field, value in fields.items():
+            self.set(field, value)
+
+    @classmethod
+    def from_dict(cls, record):
+        # Unrolled rather than going through set(): this runs once per record loaded
+        compact = cls.__new__(cls)
+        get = record.get
+        compact.name = get("name", _MISSING)
+        compact.firm = get("firm", _MISSING)
+        compact.phone = get("phone", _MISSING)
+        compact.address = get("address", _MISSING)
+        compact.website = get("website", _MISSING)
+        specialties = get("specialties", _MISSING)
+        compact.specialties = specialty_tuple(specialties) if isinstance(specialties, list) else specialties
+        state = get("state", _MISSING)
+        compact.state = sys.intern(state) if isinstance(state, str) else state
+        source = get("source", _MISSING)
+        compact.source = sys.intern(source) if isinstance(source, str) else source
+        compact.extra = None
+        compact.order = None
+
+        keys = tuple(record)
+        if keys != RECORD_FIELDS:
+            extra = {key: value for key, value in record.items() if key not in RECORD_FIELDS}
+            compact.extra = extra or None
+            if keys != tuple(f for f in RECORD_FIELDS if f in record) + tuple(extra):
+                compact.order = keys
+        return compact
+
+    def set(self, field, value):
+        if field == "specialties" and isinstance(value, list):
+            value = specialty_tuple(value)
+        elif field in _INTERNED_FIELDS and isinstance(value, str):
+            value = sys.intern(value)
+        if field in RECORD_FIELDS:
+            setattr(self, field, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[field] = value
+
+    def get(self, field, default=None):
+        """dict.get() lookalike, so record_key()/normalize_record() accept either form."""
+        if field in RECORD_FIELDS:
+            value = getattr(self, field)
+            if value is _MISSING:
+                return default
+            return list(value) if field == "specialties" and isinstance(value, tuple) else value
+        return (self.extra or {}).get(field, default)
+
+    def to_dict(self):
+        record = {}
+        for field in RECORD_FIELDS:
+            value = getattr(self, field)
+            if value is not _MISSING:
+                record[field] = list(value) if field == "specialties" and isinstance(value, tuple) else value
+        if self.extra:
+            record.update(self.extra)
+        if self.order:
+            ordered = {key: record[key] for key in self.order if key in record}
+            ordered.update(record)  # Keys set after loading go last
+            record = ordered
+        return record
+
+    def __eq__(self, other):
+        if not isinstance(other, AttorneyRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"AttorneyRecord({self.to_dict()!r})"
+
+def iter_compact_records(path):
+    """iter_records(), yielding AttorneyRecord instead of dicts."""
+    for record in iter_records(path):
+        yield AttorneyRecord.from_dict(record)
+
+# --- CANONICAL FORMS ---
+
+_NAME_NOISE = {"jr", "sr", "ii", "iii", "iv", "esq", "mr", "mrs", "ms", "dr", "hon"}
+_FIRM_NOISE = {"llc", "pllc", "pc", "pa", "llp", "lpa", "ltd", "inc", "co", "chartered",
+               "the", "law", "firm", "office", "offices", "of", "group", "attorneys", "attorney", "at"}
+
+def _words(value):
+    return re.sub(r"[^a-z0-9 ]+", " ", value.lower().replace("&", " and ")).split()
+
+def normalize_name(name):
+    """'Avery J. Whitfield, Esq.' -> 'avery whitfield' (initials, suffixes and punctuation dropped)."""
+    if not name:
+        return ""
+    return " ".join(w for w in _words(name) if len(w) > 1 and w not in _NAME_NOISE)
+
+def normalize_phone(phone):
+    """Digits only, without a leading US country code: '(843) 555-0100' -> '8435550100'."""
+    if not phone:
+        return ""
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits
+
+def canonical_firm(firm):
+    """'The Whitfield & Rutledge Law Firm, LLC' -> 'whitfield and rutledge'."""
+    if not firm:
+        return ""
+    return " ".join(w for w in _words(firm) if w not in _FIRM_NOISE)
+
+def canonical_website(url):
+    """Host and path only: 'https://www.Example.com/a/?ref=x' -> 'example.com/a'."""
+    if not url:
+        return ""
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    return host + parts.path.rstrip("/")
+
+def city_from_address(address, state):
+    """'Greenville , SC 29601' -> 'Greenville'. The parser falls back to the state name when a card has no address."""
+    if not address or address == state or "," not in address:
+        return None
+    return address.split(",", 1)[0].strip() or None
+
+# --- KEYS AND HASHES ---
+
+def _clean(value):
+    if value is None:
+        return None
+    value = " ".join(value.split())
+    return value or None
+
+def normalize_record(record):
+    """Whitespace-collapsed copy of `record` with specialties de-duplicated and sorted."""
+    normalized = {field: _clean(record.get(field)) for field in RECORD_FIELDS if field != "specialties"}
+    normalized["specialties"] = sorted({_clean(s) for s in record.get("specialties") or [] if _clean(s)})
+    return normalized
+
+def record_key(record):
+    """Identity of a record, matching the ON CONFLICT (name, phone) key of public.attorneys.
+
+    Postgres never conflicts on a NULL phone; here a missing phone keys as an
+    empty one so such records can still be tracked between snapshots.
+    """
+    return f"{_clean(record.get('name')) or ''}\x1f{_clean(record.get('phone')) or ''}"
+
+def record_hash(record):
+    """Content hash of the normalized record; equal hashes mean nothing worth re-writing changed."""
+    canonical = json.dumps(normalize_record(record), sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
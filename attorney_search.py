@@ -0,0 +1,339 @@
+import argparse
+import bisect
+import csv
+import gzip
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from itertools import accumulate
+
+from attorney_records import city_from_address, iter_records
+from script_imports import STATE_NAMES
+
+# Static search index over attorney records, sharded by state.
+#
+# Each state's shard is one gzip-compressed JSON file holding the state's
+# attorneys and an inverted index over the words of their name, firm, city
+# and specialties:
+#
+#   docs      [[name, firm, city, specialties, phone, website], ...]
+#   terms     every distinct word, sorted, so a prefix is a bisect away
+#   postings  per term, the ids of the docs containing it, delta-encoded
+#   trigrams  per trigram ("  wh", " wh", "whi", ...), the ids of the terms
+#             containing it, delta-encoded; used for typo-tolerant lookups
+#
+# A query matches docs containing every query word (AND). The last word is
+# taken as a prefix, as the user is still typing it; a word with no exact
+# term falls back to terms sharing enough trigrams with it (Dice similarity
+# of at least FUZZY_THRESHOLD). index.json lists the shards.
+#
+# Input is scraper output (NDJSON, .gz, or a legacy JSON array) or a CSV
+# export of public.attorneys with a header row, e.g.
+#
+#   \copy (SELECT name, firm, city, state, specialties, phone, website FROM public.attorneys) TO 'attorneys.csv' CSV HEADER
+#
+#   python attorney_search.py build attorneys_us.ndjson --output search_index
+#   python attorney_search.py query "whitfeld civil" --state "South Carolina"
+#
+# Run attorney_dedup.py first; duplicate records are indexed as they come.
+
+INDEX_DIR = "search_index"
+MANIFEST_FILE = "index.json"
+DOC_FIELDS = ("name", "firm", "city", "specialties", "phone", "website")
+INDEXED_FIELDS = ("name", "firm", "city", "specialties")
+STOP_WORDS = {"the", "of", "and", "at", "in", "for"}
+MIN_TERM = 2
+FUZZY_THRESHOLD = 0.5
+MAX_FUZZY_TERMS = 8  # Closest terms kept per misspelled word
+LIMIT = 20
+
+# --- TEXT ---
+
+def fold(text):
+    """Lowercase ASCII form: 'Peña-Nieto' -> 'pena-nieto'."""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+def tokenize(text):
+    if not text:
+        return []
+    return [w for w in re.findall(r"[a-z0-9]+", fold(text)) if len(w) >= MIN_TERM and w not in STOP_WORDS]
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def state_name(state):
+    """Full state name for a record's state, which DB exports store as a code."""
+    return STATE_NAMES.get(state, state)
+
+def shard_file(state):
+    return re.sub(r"[^a-z0-9]+", "-", state.lower()).strip("-") + ".json.gz"
+
+def _delta(ids):
+    previous = 0
+    encoded = []
+    for i in ids:
+        encoded.append(i - previous)
+        previous = i
+    return encoded
+
+# --- INPUT ---
+
+def parse_array_literal(value):
+    """'{"Civil Rights",Housing}' -> ['Civil Rights', 'Housing'], as psql writes TEXT[] to CSV."""
+    if not value or value == "{}":
+        return []
+    if not value.startswith("{"):
+        return [value]
+    items = []
+    for match in re.finditer(r'"((?:[^"\\]|\\.)*)"|([^,{}]+)', value[1:-1]):
+        quoted, bare = match.groups()
+        if quoted is not None:
+            items.append(re.sub(r"\\(.)", r"\1", quoted))
+        elif bare != "NULL":
+            items.append(bare)
+    return items
+
+def iter_csv_export(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            row = {key: value or None for key, value in row.items()}
+            row["specialties"] = parse_array_literal(row.get("specialties"))
+            yield row
+
+def search_doc(record):
+    """(state, doc) for a scraped record or an exported row; scraped records carry the city in the address."""
+    state = record.get("state")
+    city = record.get("city") or city_from_address(record.get("address"), state)
+    doc = [record.get("name"), record.get("firm"), city, list(record.get("specialties") or []),
+           record.get("phone"), record.get("website")]
+    return state_name(state) if state else "Unknown", doc
+
+# --- BUILD ---
+
+def build_shard(state, docs):
+    """Inverted and trigram index for one state's docs."""
+    doc_terms = {}
+    for doc_id, doc in enumerate(docs):
+        words = set()
+        for field in INDEXED_FIELDS:
+            value = doc[DOC_FIELDS.index(field)]
+            for text in (value if isinstance(value, list) else [value]):
+                words.update(tokenize(text))
+        for word in words:
+            doc_terms.setdefault(word, []).append(doc_id)
+
+    terms = sorted(doc_terms)
+    tri_index = {}
+    for term_id, term in enumerate(terms):
+        for tri in trigrams(term):
+            tri_index.setdefault(tri, []).append(term_id)
+    return {
+        "state": state,
+        "docs": docs,
+        "terms": terms,
+        "postings": [_delta(doc_terms[term]) for term in terms],
+        "trigrams": {tri: _delta(ids) for tri, ids in sorted(tri_index.items())},
+    }
+
+def _write_gzip_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=9) as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def build_index(records, out_dir=INDEX_DIR):
+    """Writes one shard per state and the manifest. Returns the manifest."""
+    by_state = {}
+    for record in records:
+        state, doc = search_doc(record)
+        if doc[0]:
+            by_state.setdefault(state, []).append(doc)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    previous = load_manifest(out_dir) if os.path.exists(manifest_path) else {"shards": {}}
+    shards = {}
+    for state in sorted(by_state):
+        shard = build_shard(state, by_state[state])
+        name = shard_file(state)
+        _write_gzip_json(os.path.join(out_dir, name), shard)
+        shards[state] = {"file": name, "docs": len(shard["docs"]), "terms": len(shard["terms"]),
+                         "bytes": os.path.getsize(os.path.join(out_dir, name))}
+
+    # Shards of states no longer in the input would otherwise linger
+    for state, entry in previous["shards"].items():
+        if state not in shards and os.path.exists(os.path.join(out_dir, entry["file"])):
+            os.remove(os.path.join(out_dir, entry["file"]))
+
+    manifest = {"version": 1, "fields": list(DOC_FIELDS), "shards": shards}
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+# --- QUERY ---
+
+def load_manifest(index_dir):
+    with open(os.path.join(index_dir, MANIFEST_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+class Shard:
+    """One state's index, decoded for querying."""
+
+    def __init__(self, data):
+        self.state = data["state"]
+        self.docs = data["docs"]
+        self.terms = data["terms"]
+        self.postings = [list(accumulate(ids)) for ids in data["postings"]]
+        self.trigrams = {tri: list(accumulate(ids)) for tri, ids in data["trigrams"].items()}
+        self._term_ids = {term: i for i, term in enumerate(self.terms)}
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def prefix_terms(self, prefix):
+        """Ids of the terms starting with `prefix`."""
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + "\uffff")
+        return range(start, end)
+
+    def fuzzy_terms(self, word, threshold=FUZZY_THRESHOLD):
+        """[(term id, similarity)] for terms whose trigrams are close to `word`'s, best first."""
+        grams = trigrams(word)
+        shared = {}
+        for tri in grams:
+            for term_id in self.trigrams.get(tri, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+        matches = []
+        for term_id, count in shared.items():
+            similarity = 2 * count / (len(grams) + len(trigrams(self.terms[term_id])))
+            if similarity >= threshold:
+                matches.append((term_id, similarity))
+        matches.sort(key=lambda match: -match[1])
+        return matches[:MAX_FUZZY_TERMS]
+
+    def word_matches(self, word, prefix=False, fuzzy=True):
+        """{doc id: score} for one query word: 1 for an exact term, 0.9 for a prefix, the similarity for a fuzzy one."""
+        scores = {}
+
+        def add(term_id, score):
+            for doc_id in self.postings[term_id]:
+                if scores.get(doc_id, 0) < score:
+                    scores[doc_id] = score
+
+        exact = self._term_ids.get(word)
+        if exact is not None:
+            add(exact, 1.0)
+        if prefix:
+            for term_id in self.prefix_terms(word):
+                if term_id != exact:
+                    add(term_id, 0.9)
+        if not scores and fuzzy:
+            for term_id, similarity in self.fuzzy_terms(word):
+                add(term_id, similarity * 0.8)
+        return scores
+
+    def search(self, query, limit=LIMIT, fuzzy=True):
+        """[(score, doc id)] of docs matching every word of `query`, best first."""
+        words = tokenize(query)
+        if not words:
+            return []
+        totals = None
+        for i, word in enumerate(words):
+            scores = self.word_matches(word, prefix=i == len(words) - 1, fuzzy=fuzzy)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {doc_id: total + scores[doc_id] for doc_id, total in totals.items() if doc_id in scores}
+            if not totals:
+                return []
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, doc_id) for doc_id, score in ranked[:limit]]
+
+    def doc(self, doc_id):
+        record = dict(zip(DOC_FIELDS, self.docs[doc_id]))
+        record["state"] = self.state
+        return record
+
+class SearchIndex:
+    """Query API over a built index directory; shards are loaded on first use and kept."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.manifest = load_manifest(index_dir)
+        self._shards = {}
+
+    @property
+    def states(self):
+        return list(self.manifest["shards"])
+
+    def shard(self, state):
+        state = state_name(state)
+        if state not in self._shards:
+            entry = self.manifest["shards"].get(state)
+            if entry is None:
+                raise KeyError(f"no index shard for {state}")
+            self._shards[state] = Shard.load(os.path.join(self.index_dir, entry["file"]))
+        return self._shards[state]
+
+    def search(self, query, state=None, limit=LIMIT, fuzzy=True):
+        """Records matching `query`, best first, each with its "score". Without `state`, every shard is searched."""
+        hits = []
+        for name in ([state] if state else self.states):
+            shard = self.shard(name)
+            hits += [(score, shard.state, doc_id, shard) for score, doc_id in shard.search(query, limit, fuzzy)]
+        hits.sort(key=lambda hit: (-hit[0], hit[1], hit[2]))
+        results = []
+        for score, _, doc_id, shard in hits[:limit]:
+            record = shard.doc(doc_id)
+            record["score"] = round(score, 3)
+            results.append(record)
+        return results
+
+def load_input(path):
+    return iter_csv_export(path) if path.endswith(".csv") else iter_records(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the static attorney search index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Index scraper output or a CSV export")
+    build.add_argument("input", help="NDJSON, .ndjson.gz, legacy JSON array, or CSV export")
+    build.add_argument("--output", default=INDEX_DIR)
+    query = commands.add_parser("query", help="Search a built index")
+    query.add_argument("query")
+    query.add_argument("--index", default=INDEX_DIR)
+    query.add_argument("--state", help="Search one state's shard (name or code)")
+    query.add_argument("--limit", type=int, default=LIMIT)
+    query.add_argument("--exact", action="store_true", help="No typo-tolerant matching")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        manifest = build_index(load_input(args.input), args.output)
+        shards = manifest["shards"].values()
+        print(f"[+] Indexed {sum(s['docs'] for s in shards):,} attorneys in {len(shards)} state shards "
+              f"({sum(s['bytes'] for s in shards) / 1024:,.1f} KB) in {time.perf_counter() - start:.1f}s -> {args.output}")
+        return
+
+    index = SearchIndex(args.index)
+    start = time.perf_counter()
+    try:
+        results = index.search(args.query, args.state, args.limit, fuzzy=not args.exact)
+    except KeyError:
+        sys.exit(f"[!] No index shard for {state_name(args.state)}")
+    elapsed = (time.perf_counter() - start) * 1000
+    for record in results:
+        print(f"{record['score']:>5}  {record['name']} | {record['firm'] or '-'} | {record['city'] or '-'}, "
+              f"{record['state']} | {', '.join(record['specialties'])}")
+    print(f"[*] {len(results)} results in {elapsed:.1f} ms (including shard loads)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from attorney_parsers import PARSER_BACKENDS, CardStream, etree, parse_page  # noqa: E402
+
+# Cards/sec for each parser backend on the recorded Justia pages, then the
+# streaming parser against whole-page lxml on one oversized page: time to
+# the first record and peak RSS of a fresh process parsing it. The page is
+# the recorded listing with its cards repeated, fed in download-sized chunks.
+#
+#   python benchmarks/bench_parsers.py --iterations 200 --stream-cards 20000
+
+FIXTURE_DIR = os.path.join(ROOT, "fixtures", "justia")
+REFERENCE = "html.parser"
+CARD_START = '    <div class="jcard'
+LIST_END = '    </div>\n    <nav class="pagination">'
+CHUNK = 16 * 1024  # Same read size as scrape_attorneys.STREAM_CHUNK
+
+def load_fixtures():
+    pages = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+                pages[name] = f.read()
+    return pages
+
+def check_backends(pages):
+    """Every backend must return exactly the records the reference parser does."""
+    for name, html in pages.items():
+        expected = parse_page(html, parser=REFERENCE)
+        for backend in PARSER_BACKENDS:
+            got = parse_page(html, parser=backend)
+            if got != expected:
+                raise AssertionError(f"{backend} disagrees with {REFERENCE} on {name}")
+
+def big_page_chunks(html, copies):
+    """The listing with its cards repeated until there are at least `copies`, as encoded chunks."""
+    head, rest = html.split(CARD_START, 1)
+    cards, tail = rest.split(LIST_END, 1)
+    cards = (CARD_START + cards).encode("utf-8")
+    per_copy = cards.count(b'class="jcard')
+    yield head.encode("utf-8")
+    for _ in range(-(-copies // per_copy)):
+        yield cards
+    yield (LIST_END + tail).encode("utf-8")
+
+def rechunk(chunks, size=CHUNK):
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= size:
+            yield buffer[:size]
+            buffer = buffer[size:]
+    if buffer:
+        yield buffer
+
+def parse_big_page(mode, html, copies):
+    """Runs in a fresh process: (records, seconds to first record, total seconds, peak RSS MB)."""
+    first = None
+    start = time.perf_counter()
+    if mode == "stream":
+        count = 0
+        def emit(record):
+            nonlocal count, first
+            count += 1
+            if first is None:
+                first = time.perf_counter() - start
+        stream = CardStream("South Carolina", emit)
+        for chunk in rechunk(big_page_chunks(html, copies)):
+            stream.feed(chunk)
+        stream.close()
+    else:
+        # A whole-page parse waits for the full body before the first record
+        body = b"".join(rechunk(big_page_chunks(html, copies))).decode("utf-8")
+        count = len(parse_page(body, "South Carolina", "lxml"))
+        first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return count, first, total, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def bench_backend(backend, html, iterations):
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        cards += len(parse_page(html, parser=backend))
+    elapsed = time.perf_counter() - start
+    return cards / elapsed, iterations / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark attorney listing parser backends.")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--stream-cards", type=int, default=10_000, help="Cards on the oversized page (0 to skip)")
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    check_backends(pages)
+    print(f"[+] All {len(PARSER_BACKENDS)} backends match {REFERENCE} on {len(pages)} recorded pages")
+
+    html = pages["civil-rights-listing.html"]
+    print(f"\n{'backend':<12} {'cards/sec':>12} {'pages/sec':>12}")
+    for backend in PARSER_BACKENDS:
+        cards_per_sec, pages_per_sec = bench_backend(backend, html, args.iterations)
+        print(f"{backend:<12} {cards_per_sec:>12,.0f} {pages_per_sec:>12,.1f}")
+
+    if args.stream_cards and etree is not None:
+        expected = parse_page(html, parser="lxml")
+        got = []
+        stream = CardStream("South Carolina", got.append)
+        for chunk in rechunk([html.encode("utf-8")], 512):
+            stream.feed(chunk)
+        stream.close()
+        if got != expected:
+            raise AssertionError("CardStream disagrees with lxml on civil-rights-listing.html")
+
+        print(f"\n{'mode':<12} {'records':>10} {'first ms':>10} {'total ms':>10} {'peak RSS MB':>12}")
+        context = multiprocessing.get_context("spawn")  # Fresh process per mode, so peaks don't carry over
+        for mode in ("lxml", "stream"):
+            with context.Pool(1) as pool:
+                count, first, total, peak = pool.apply(parse_big_page, (mode, html, args.stream_cards))
+            print(f"{mode:<12} {count:>10,} {first * 1000:>10,.1f} {total * 1000:>10,.1f} {peak:>12,.1f}")
+
+if __name__ == "__main__":
+    main()
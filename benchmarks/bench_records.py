@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from attorney_records import AttorneyRecord  # noqa: E402
+from scrape_attorneys import STATES  # noqa: E402
+
+# Memory held by scraped records as dicts vs. AttorneyRecord, measured with
+# tracemalloc. Records are decoded from JSON lines, like every downstream
+# stage does, so each dict has its own copy of the repeated strings.
+#
+#   python benchmarks/bench_records.py --records 100000
+
+SPECIALTIES = ["Civil Rights", "Police Misconduct", "Constitutional Law", "First Amendment", "Employment Discrimination",
+               "Wrongful Conviction", "Prisoners' Rights", "Voting Rights", "Housing Discrimination", "Excessive Force"]
+
+def make_lines(count):
+    """JSON lines shaped like scraper output, with realistic repetition of state and specialties."""
+    rng = random.Random(0)
+    lines = []
+    for i in range(count):
+        state = rng.choice(STATES)[0]
+        record = {
+            "name": f"Attorney {i}",
+            "firm": rng.choice([None, f"Firm {i % 5000} LLC"]),
+            "phone": f"({rng.randint(200, 999)}) 555-{rng.randint(1000, 9999)}",
+            "address": f"{rng.randint(1, 9999)} Main St, {state}",
+            "website": f"https://www.justia.com/lawyers/attorney-{i}",
+            "specialties": rng.sample(SPECIALTIES, k=rng.randint(1, 3)),
+            "state": state,
+            "source": "Justia",
+        }
+        lines.append(json.dumps(record, ensure_ascii=False))
+    return lines
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, after - before
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of dict and AttorneyRecord records.")
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    lines = make_lines(args.records)
+    dicts, dict_bytes = measure(lambda: [json.loads(line) for line in lines])
+    compact, compact_bytes = measure(lambda: [AttorneyRecord.from_dict(json.loads(line)) for line in lines])
+
+    if [record.to_dict() for record in compact] != dicts:
+        raise AssertionError("AttorneyRecord round trip is not lossless")
+    print(f"[+] {args.records:,} records round-trip losslessly")
+
+    print(f"\n{'form':<16} {'MB':>8} {'bytes/record':>14}")
+    for form, size in (("dict", dict_bytes), ("AttorneyRecord", compact_bytes)):
+        print(f"{form:<16} {size / (1 << 20):>8.1f} {size / args.records:>14,.0f}")
+    print(f"\n[+] AttorneyRecord saves {1 - compact_bytes / dict_bytes:.0%}")
+
+if __name__ == "__main__":
+    main()
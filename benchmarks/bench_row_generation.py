@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from generate_mega_seed import ROW_ENGINES, np  # noqa: E402
+
+# Rows/sec for the per-row and NumPy-batched fixture row generators.
+#
+#   python benchmarks/bench_row_generation.py --rows 200000
+
+REFERENCE = "python"
+
+def check_rows(engine, rows):
+    """Batched rows must have the same shape and column types as the per-row ones."""
+    for table, generator in ROW_ENGINES[engine].items():
+        random.seed(0)
+        expected = list(ROW_ENGINES[REFERENCE][table](rows))
+        random.seed(0)
+        got = list(generator(rows))
+        if len(got) != len(expected):
+            raise AssertionError(f"{engine} {table}: {len(got)} rows, expected {len(expected)}")
+        for got_row, expected_row in zip(got, expected):
+            # Nullable columns (alias) may be None on either side
+            same = len(got_row) == len(expected_row) and all(
+                a is None or b is None or type(a) is type(b) for a, b in zip(got_row, expected_row))
+            if not same:
+                raise AssertionError(f"{engine} {table}: row {got_row!r} does not match {expected_row!r}")
+
+def bench_table(engine, table, rows):
+    random.seed(0)
+    start = time.perf_counter()
+    for _ in ROW_ENGINES[engine][table](rows):
+        pass
+    return rows / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs batched fixture row generation.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if np is None:
+        print("[!] numpy is not installed; only the per-row engine is available")
+        return
+
+    check_rows("numpy", 1000)
+    print(f"[+] numpy rows match {REFERENCE} rows in shape and column types")
+
+    print(f"\n{'table':<12} {'python rows/s':>14} {'numpy rows/s':>14} {'speedup':>8}")
+    for table in ROW_ENGINES[REFERENCE]:
+        per_row = bench_table("python", table, args.rows)
+        batched = bench_table("numpy", table, args.rows)
+        print(f"{table:<12} {per_row:>14,.0f} {batched:>14,.0f} {batched / per_row:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "scripts")):
+    sys.path.insert(0, path)
+
+import generate_mega_seed  # noqa: E402
+from attorney_search import SearchIndex, build_index  # noqa: E402
+from crawl_metrics import QUANTILES, quantile  # noqa: E402
+from generate_mega_seed import ATTORNEY_COLUMNS, LAST_NAMES, SPECIALTIES  # noqa: E402
+
+# Build cost, size and query latency of the static attorney search index.
+#
+# Records come from the fixture generator's attorney rows. Queries are
+# prefixes (a last name cut short, as while typing), typos (a last name
+# with one edit) and two-word queries, each run against one state's shard
+# and across every shard, with the shards already loaded.
+#
+#   python benchmarks/bench_search.py --records 100000 --queries 2000
+
+def make_records(count):
+    random.seed(0)
+    for row in generate_mega_seed.attorney_rows(count):
+        yield dict(zip(ATTORNEY_COLUMNS, row))
+
+def typo(word, rng):
+    """One random edit: drop, swap or replace a letter."""
+    word = word.lower()
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(("drop", "swap", "replace"))
+    if edit == "drop":
+        return word[:i] + word[i + 1:]
+    if edit == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice("aeiourst") + word[i + 1:]
+
+def make_queries(kind, count, rng):
+    queries = []
+    for _ in range(count):
+        name = rng.choice(LAST_NAMES)
+        if kind == "prefix":
+            queries.append(name[:rng.randint(2, max(2, len(name) - 1))])
+        elif kind == "fuzzy":
+            queries.append(typo(name, rng))
+        else:
+            queries.append(f"{rng.choice(SPECIALTIES).split()[0]} {name[:3]}")
+    return queries
+
+def time_queries(index, queries, state):
+    latencies = []
+    results = 0
+    for query in queries:
+        start = time.perf_counter()
+        results += len(index.search(query, state))
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return [quantile(latencies, q) for q in QUANTILES], len(queries) / (sum(latencies) / 1000), results / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the static attorney search index.")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--state", default="California", help="State for the single-shard runs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        manifest = build_index(make_records(args.records), tmp)
+        build_seconds = time.perf_counter() - start
+        size = sum(shard["bytes"] for shard in manifest["shards"].values())
+        print(f"[+] Indexed {args.records:,} records into {len(manifest['shards'])} shards: "
+              f"{size / (1 << 20):.1f} MB compressed, {build_seconds:.1f}s")
+
+        index = SearchIndex(tmp)
+        start = time.perf_counter()
+        for state in index.states:
+            index.shard(state)
+        print(f"[+] Loaded every shard in {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(1)
+        header = "/".join(f"p{round(q * 100)}" for q in QUANTILES)
+        print(f"\n{'queries':<10} {'scope':<12} {header + ' ms':>22} {'queries/sec':>12} {'hits/query':>11}")
+        for kind in ("prefix", "fuzzy", "two-word"):
+            queries = make_queries(kind, args.queries, rng)
+            for scope, state in ((args.state, args.state), ("all states", None)):
+                latency, rate, hits = time_queries(index, queries, state)
+                print(f"{kind:<10} {scope:<12} {'/'.join(f'{ms:.2f}' for ms in latency):>22} {rate:>12,.0f} {hits:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "scripts"), os.path.join(ROOT, "fixtures")):
+    sys.path.insert(0, path)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import generate_mega_seed  # noqa: E402
+import generate_scanners_and_foia  # noqa: E402
+from attorney_parsers import CARD_CLASS, parse_attorney  # noqa: E402
+from scrape_attorneys import scrape  # noqa: E402
+from serve_justia import LISTING_PAGE, start_server  # noqa: E402
+
+# Benchmark suite for the scraper and generator hot paths.
+#
+#   python benchmarks/run_benchmarks.py                   # compare with baseline.json
+#   python benchmarks/run_benchmarks.py --save-baseline   # after an intended change
+#   python benchmarks/run_benchmarks.py --sizes 1000 100000 --only generate_attorneys
+#
+# Results are written as JSON and every metric is compared with the stored
+# baseline: */sec metrics regress when they drop, *_mb metrics when they
+# grow, by more than --tolerance. The exit status is 1 on any regression, so
+# this can gate a big crawl or seed job. Baselines are machine specific;
+# re-save one when moving to a different box.
+
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baseline.json")
+RESULTS_FILE = os.path.join(ROOT, "benchmarks", "results.json")
+SIZES = [1_000, 100_000, 1_000_000]
+TOLERANCE = 0.20
+MEMORY_FLOOR_MB = 5  # Peak-memory differences below this are noise
+WARMUP_ROWS = 1_000  # Untimed pass before each generator case
+MIN_TIME = 1.0  # Generator cases repeat until this many seconds are timed; the fastest pass counts
+
+# --- SCRAPER ---
+
+def load_listing():
+    with open(LISTING_PAGE, encoding="utf-8") as f:
+        return f.read()
+
+def bench_parse_attorney(iterations=200):
+    cards = BeautifulSoup(load_listing(), "html.parser").find_all("div", class_=CARD_CLASS)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for card in cards:
+            parse_attorney(card, "South Carolina")
+    elapsed = time.perf_counter() - start
+    return {"cards_per_sec": len(cards) * iterations / elapsed}
+
+def bench_scrape(pages=50):
+    """Whole-page fetch + parse + write through scrape(), against the local fixture server."""
+    server, base_url = start_server(pages)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "attorneys.ndjson")
+            with contextlib.redirect_stdout(io.StringIO()):
+                scrape(base_url, 1, output, min_interval=0)  # warm up the UA pool and imports
+                start = time.perf_counter()
+                scrape(base_url, pages, output, min_interval=0)
+                elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+    return {"pages_per_sec": pages / elapsed}
+
+# --- GENERATORS ---
+
+ESCAPE_SAMPLES = ["Law Offices of James Smith", "Prisoners' Rights", None, "O'Brien & O'Neil, LLP",
+                  "Officer escalated a routine stop and detained me without articulating a crime."]
+
+def bench_escape_sql(iterations=200_000):
+    escape_sql = generate_mega_seed.escape_sql
+    start = time.perf_counter()
+    for _ in range(iterations // len(ESCAPE_SAMPLES)):
+        for text in ESCAPE_SAMPLES:
+            escape_sql(text)
+    elapsed = time.perf_counter() - start
+    return {"calls_per_sec": iterations // len(ESCAPE_SAMPLES) * len(ESCAPE_SAMPLES) / elapsed}
+
+def _scanner_statements(rows):
+    locations = sum(len(generate_scanners_and_foia.LOCATIONS.get(code, ["Main"]))
+                    for _, code in generate_scanners_and_foia.STATES)
+    feeds = max(1, round(rows / locations))
+    return generate_scanners_and_foia.generate_scanner_links(feeds), feeds * locations
+
+def generator_statements(name, rows):
+    """(statement iterator, rows it produces) for a generator case."""
+    base, _, engine = name.partition("[")
+    engine = engine.rstrip("]") or "python"
+    if base == "generate_attorneys":
+        return generate_mega_seed.generate_attorneys(rows, engine), rows
+    if base == "generate_activists":
+        return generate_mega_seed.generate_activists(rows, engine), rows
+    if base == "generate_users_and_activity":
+        return generate_mega_seed.generate_users_and_activity(50, rows, 0, engine), rows
+    if base == "generate_scanner_links":
+        return _scanner_statements(rows)
+    if base == "generate_foia_agencies":
+        # One statement per agency row; counted up front so formatting stays inside the timed loop
+        return generate_scanners_and_foia.generate_foia_agencies(), sum(1 for _ in generate_scanners_and_foia.foia_rows())
+    raise ValueError(f"unknown generator case {name}")
+
+GENERATOR_CASES = ["generate_attorneys", "generate_activists", "generate_users_and_activity",
+                   "generate_scanner_links", "generate_attorneys[numpy]", "generate_activists[numpy]",
+                   "generate_users_and_activity[numpy]"]
+FIXED_SIZE_CASES = ["generate_foia_agencies"]  # Always the full agency list
+
+def _max_rss_mb():
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024  # bytes on macOS, KB elsewhere
+
+def time_generator_pass(name, rows):
+    """(seconds, rows produced, output bytes) for one pass over a generator case, from the same seed."""
+    random.seed(0)
+    statements, produced = generator_statements(name, rows)
+    size = 0
+    start = time.perf_counter()
+    for statement in statements:
+        size += len(statement)
+    return time.perf_counter() - start, produced, size
+
+def run_generator_case(name, rows):
+    """Runs in a fresh spawned process so peak RSS belongs to this case alone.
+
+    A small untimed pass warms up imports and caches, then timed passes
+    repeat until MIN_TIME has been spent and the fastest one is reported.
+    """
+    before = _max_rss_mb()
+    time_generator_pass(name, rows and min(rows, WARMUP_ROWS))
+    best = total = None
+    while total is None or total < MIN_TIME:
+        elapsed, produced, size = time_generator_pass(name, rows)
+        best = elapsed if best is None else min(best, elapsed)
+        total = (total or 0) + elapsed
+    return {"rows_per_sec": produced / best, "peak_mb": _max_rss_mb() - before, "rows": produced,
+            "output_mb": size / (1 << 20)}
+
+def bench_generator(name, rows):
+    # A forked worker inherits the parent's ru_maxrss, which hides any peak below it
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_generator_case, name, rows).result()
+
+# --- SUITE ---
+
+def suite(sizes, scrape_pages):
+    """Yields (benchmark name, thunk returning its metrics)."""
+    yield "parse_attorney", bench_parse_attorney
+    yield "scrape", lambda: bench_scrape(scrape_pages)
+    yield "escape_sql", bench_escape_sql
+    for name in GENERATOR_CASES:
+        for rows in sizes:
+            yield f"{name}@{rows}", lambda name=name, rows=rows: bench_generator(name, rows)
+    for name in FIXED_SIZE_CASES:
+        yield name, lambda name=name: bench_generator(name, None)
+
+def compare(results, baseline, tolerance):
+    """Returns [(benchmark, metric, baseline value, current value)] for regressed metrics."""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if old is None:
+                continue
+            if metric.endswith("_per_sec") and value < old * (1 - tolerance):
+                regressions.append((name, metric, old, value))
+            elif metric.endswith("_mb") and value > old * (1 + tolerance) and value - old > MEMORY_FLOOR_MB:
+                regressions.append((name, metric, old, value))
+    return regressions
+
+def format_metrics(metrics):
+    return "  ".join(f"{metric}={value:,.1f}" if isinstance(value, float) else f"{metric}={value:,}"
+                     for metric, value in metrics.items())
+
+def save_json(path, results):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper and generator hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Row counts for each generator")
+    parser.add_argument("--scrape-pages", type=int, default=50)
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown/growth, e.g. 0.2")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name, run in suite(args.sizes, args.scrape_pages):
+        if args.only and args.only not in name:
+            continue
+        results[name] = run()
+        print(f"{name:<44} {format_metrics(results[name])}")
+
+    save_json(args.output, results)
+    print(f"\n[+] Results saved to {args.output}")
+
+    if args.save_baseline:
+        save_json(args.baseline, results)
+        print(f"[+] Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"[*] No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, metric, old, value in regressions:
+        print(f"[!] {name} {metric}: {old:,.1f} -> {value:,.1f}")
+    if regressions:
+        print(f"[!] {len(regressions)} regressions beyond {args.tolerance:.0%} of the baseline")
+        sys.exit(1)
+    print(f"[+] No regressions beyond {args.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import json
+import math
+import os
+import time
+
+import aiohttp
+
+# Per-request crawl metrics.
+#
+# Every listing page fetched produces one JSON line in the metrics log:
+#
+#   {"ts": 1767600000.0, "state": "South Carolina", "page": 3, "url": "...",
+#    "status": 200, "cache": "miss", "dns_ms": 1.2, "connect_ms": 8.4,
+#    "ttfb_ms": 210.5, "total_ms": 240.1, "bytes": 48213, "parse_ms": 9.7,
+#    "cards": 20, "records": 20, "attempts": 1}
+#
+# dns_ms and connect_ms are null when a pooled connection was reused; the
+# timings are those of the last attempt when a request was retried. On
+# close, a Prometheus textfile (node_exporter textfile collector format) is
+# written with p50/p95/p99 of each latency phase, response size and parse
+# time, plus counters by status. Every listing ends with a page without
+# cards, but a listing whose *first* page has none usually means the page
+# layout changed; those are counted in scrape_empty_first_pages_total.
+#
+# "cache" is "hit" when the page's stored records were reused (200 with an
+# unchanged body, or 304), "miss" when the page was parsed, "off" without a
+# cache. Cached pages are not re-parsed, so they have no parse_ms.
+#
+#   python scrape_attorneys.py --metrics-log crawl_metrics.jsonl --metrics-textfile crawl_metrics.prom
+
+LOG_FILE = "crawl_metrics.jsonl"
+TEXTFILE = "crawl_metrics.prom"
+QUANTILES = (0.5, 0.95, 0.99)
+PHASES = ("dns", "connect", "ttfb", "total")
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 3)
+
+# aiohttp request tracing. The per-request dict is passed as
+# trace_request_ctx and filled with the phase timings as they happen.
+
+async def _on_request_start(session, ctx, params):
+    timing = ctx.trace_request_ctx
+    if isinstance(timing, dict):
+        timing["_start"] = time.perf_counter()
+
+async def _on_dns_start(session, ctx, params):
+    ctx.dns_start = time.perf_counter()
+
+async def _on_dns_end(session, ctx, params):
+    timing = ctx.trace_request_ctx
+    if isinstance(timing, dict):
+        timing["dns_ms"] = _elapsed_ms(ctx.dns_start)
+
+async def _on_connect_start(session, ctx, params):
+    ctx.connect_start = time.perf_counter()
+
+async def _on_connect_end(session, ctx, params):
+    timing = ctx.trace_request_ctx
+    if isinstance(timing, dict):
+        # Connection setup includes the DNS lookup; report TCP/TLS on its own
+        timing["connect_ms"] = round(_elapsed_ms(ctx.connect_start) - (timing.get("dns_ms") or 0), 3)
+
+async def _on_request_end(session, ctx, params):
+    timing = ctx.trace_request_ctx
+    if isinstance(timing, dict) and "_start" in timing:
+        timing["ttfb_ms"] = _elapsed_ms(timing["_start"])
+
+def request_tracer():
+    """TraceConfig that records DNS, connect and time-to-headers into each request's dict."""
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_on_request_start)
+    trace.on_dns_resolvehost_start.append(_on_dns_start)
+    trace.on_dns_resolvehost_end.append(_on_dns_end)
+    trace.on_connection_create_start.append(_on_connect_start)
+    trace.on_connection_create_end.append(_on_connect_end)
+    trace.on_request_end.append(_on_request_end)
+    return trace
+
+def quantile(sorted_values, q):
+    """Nearest-rank quantile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def _summary_lines(metric, values, scale, label=""):
+    """Quantile, _sum and _count samples of one (optionally labelled) summary series."""
+    values = sorted(values)
+    prefix = f"{label}," if label else ""
+    lines = []
+    for q in QUANTILES:
+        value = quantile(values, q)
+        value = "NaN" if value is None else repr(value * scale)
+        lines.append(f'{metric}{{{prefix}quantile="{q}"}} {value}')
+    braces = f"{{{label}}}" if label else ""
+    lines.append(f"{metric}_sum{braces} {sum(values) * scale!r}")
+    lines.append(f"{metric}_count{braces} {len(values)}")
+    return lines
+
+class CrawlMetrics:
+    """Collects one sample per fetched page; writes the JSONL log as it goes and the textfile on close."""
+
+    def __init__(self, log_path=None, textfile_path=None):
+        self.log_path = log_path
+        self.textfile_path = textfile_path
+        self._log = open(log_path, "a", encoding="utf-8", buffering=1) if log_path else None
+        self.series = {f"{phase}_ms": [] for phase in PHASES}
+        self.series.update({"bytes": [], "parse_ms": []})
+        self.statuses = {}
+        self.cards = 0
+        self.records = 0
+        self.empty_first_pages = 0
+        self.errors = 0
+        self.retries = 0
+
+    def record(self, sample):
+        """Adds a page sample (see the module comment for its fields)."""
+        sample = {"ts": round(time.time(), 3), **{k: v for k, v in sample.items() if not k.startswith("_")}}
+        if self._log:
+            self._log.write(json.dumps(sample, ensure_ascii=False) + "\n")
+
+        for name, values in self.series.items():
+            if sample.get(name) is not None:
+                values.append(sample[name])
+        status = str(sample.get("status") or "error")
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if sample.get("error"):
+            self.errors += 1
+        self.retries += max(0, (sample.get("attempts") or 1) - 1)
+        self.cards += sample.get("cards") or 0
+        self.records += sample.get("records") or 0
+        if sample.get("page") == 1 and sample.get("cards") == 0:
+            self.empty_first_pages += 1
+
+    def percentiles(self, name):
+        values = sorted(self.series[name])
+        return {q: quantile(values, q) for q in QUANTILES}
+
+    def summary(self):
+        pages = sum(self.statuses.values())
+        total = self.percentiles("total_ms")
+        parse = self.percentiles("parse_ms")
+        if not pages:
+            return "no pages fetched"
+        latency = "/".join(f"{total[q]:.0f}" if total[q] is not None else "-" for q in QUANTILES)
+        parsing = "/".join(f"{parse[q]:.1f}" if parse[q] is not None else "-" for q in QUANTILES)
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        return (f"{pages} pages ({statuses}), total p50/p95/p99 {latency} ms, parse {parsing} ms, "
+                f"{self.cards} cards, {self.records} records, {self.retries} retries, {self.empty_first_pages} empty first pages")
+
+    def textfile(self):
+        metric = "scrape_request_duration_seconds"
+        lines = [f"# HELP {metric} Listing request latency by phase (dns, connect, ttfb, total)",
+                 f"# TYPE {metric} summary"]
+        for phase in PHASES:
+            lines += _summary_lines(metric, self.series[f"{phase}_ms"], 1 / 1000, f'phase="{phase}"')
+        for metric, help_text, series, scale in (
+                ("scrape_response_bytes", "Listing response body size", "bytes", 1),
+                ("scrape_parse_duration_seconds", "Time to parse a listing page", "parse_ms", 1 / 1000)):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+            lines += _summary_lines(metric, self.series[series], scale)
+
+        lines += ["# HELP scrape_requests_total Listing requests by HTTP status",
+                  "# TYPE scrape_requests_total counter"]
+        for status, count in sorted(self.statuses.items()):
+            lines.append(f'scrape_requests_total{{status="{status}"}} {count}')
+        for metric, help_text, value in (
+                ("scrape_cards_total", "Attorney cards found on listing pages", self.cards),
+                ("scrape_records_total", "Records parsed from those cards", self.records),
+                ("scrape_empty_first_pages_total", "Listings whose first page had no attorney cards",
+                 self.empty_first_pages),
+                ("scrape_errors_total", "Requests that raised before a response", self.errors),
+                ("scrape_retries_total", "Retried attempts after throttling or transient failures", self.retries)):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        # Written atomically so the textfile collector never reads half a file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.textfile())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
+        if self.textfile_path:
+            self.write_textfile(self.textfile_path)
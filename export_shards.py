@@ -0,0 +1,161 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+from attorney_records import iter_records
+from attorney_search import search_doc, shard_file
+from script_imports import STATE_CODES, generator
+
+scanners_and_foia = generator("generate_scanners_and_foia")
+
+# Static per-state data shards for the service worker and CDN.
+#
+# Every dataset (scanner links, FOIA agencies, and scraped attorneys when
+# given) is split by state into gzip-compressed JSON shards whose file names
+# carry a hash of their content:
+#
+#   public/data/manifest.json
+#   public/data/shards/<dataset>/<state>.<hash>.json.gz   {"dataset", "state", "columns", "rows"}
+#
+# A shard's URL changes whenever its content does, so shards can be cached
+# forever (see vercel.json and public/sw.js) and clients only re-fetch the
+# manifest. On a rebuild, shards whose content is unchanged are left alone;
+# files no longer referenced by this manifest or the previous one are pruned,
+# so clients holding the previous manifest can still finish their fetches.
+#
+# Scanner feed ids and listener counts are drawn at random from a stream
+# seeded per state (--seed, default 0), so a state's shard only changes
+# when that state's own inputs do.
+#
+#   python export_shards.py --attorneys attorneys_us.ndjson
+#   python export_shards.py --output dist/data --seed 7
+
+DATA_DIR = "public/data"
+SHARD_DIR = "shards"
+MANIFEST_FILE = "manifest.json"
+HASH_LENGTH = 16  # Hex digits of the sha256 kept in file names
+
+ATTORNEY_COLUMNS = ("name", "firm", "city", "specialties", "phone", "website")
+
+# --- DATASETS ---
+
+def rows_by_state(rows, state_index):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row[state_index], []).append(list(row))
+    return grouped
+
+def attorney_rows_by_state(path):
+    grouped = {}
+    for record in iter_records(path):
+        state, doc = search_doc(record)
+        if doc[0]:
+            grouped.setdefault(state, []).append(doc)
+    return grouped
+
+def datasets(attorneys=None, feeds_per_location=1, seed=0):
+    """{dataset: (columns, {state name: [rows]})}."""
+    result = {
+        "scanner_links": (scanners_and_foia.SCANNER_COLUMNS,
+                          rows_by_state(scanners_and_foia.scanner_rows(feeds_per_location, seed),
+                                        scanners_and_foia.SCANNER_COLUMNS.index("state"))),
+        "foia_agencies": (scanners_and_foia.FOIA_COLUMNS,
+                          rows_by_state(scanners_and_foia.foia_rows(), scanners_and_foia.FOIA_COLUMNS.index("state"))),
+    }
+    if attorneys:
+        result["attorneys"] = (ATTORNEY_COLUMNS, attorney_rows_by_state(attorneys))
+    return result
+
+# --- SHARDS ---
+
+def shard_payload(dataset, state, columns, rows):
+    """Canonical JSON bytes of a shard; equal content gives equal bytes, and so an equal hash."""
+    shard = {"dataset": dataset, "state": state, "code": STATE_CODES.get(state), "columns": list(columns), "rows": rows}
+    return json.dumps(shard, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+def write_shard(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(gzip.compress(payload, compresslevel=9, mtime=0))
+    os.replace(tmp_path, path)
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"datasets": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def manifest_files(manifest):
+    return {entry["file"] for dataset in manifest["datasets"].values() for entry in dataset["states"].values()}
+
+def export_dataset(out_dir, dataset, columns, grouped):
+    """Writes the changed shards of one dataset. Returns (manifest entry, shards written, shards unchanged)."""
+    shard_dir = os.path.join(out_dir, SHARD_DIR, dataset)
+    os.makedirs(shard_dir, exist_ok=True)
+    states = {}
+    written = unchanged = 0
+    for state in sorted(grouped):
+        payload = shard_payload(dataset, state, columns, grouped[state])
+        digest = hashlib.sha256(payload).hexdigest()
+        name = f"{shard_file(state)[:-len('.json.gz')]}.{digest[:HASH_LENGTH]}.json.gz"
+        path = os.path.join(shard_dir, name)
+        if os.path.exists(path):
+            unchanged += 1
+        else:
+            write_shard(path, payload)
+            written += 1
+        states[state] = {"code": STATE_CODES.get(state), "file": f"{SHARD_DIR}/{dataset}/{name}", "sha256": digest,
+                         "rows": len(grouped[state]), "bytes": os.path.getsize(path)}
+    return {"columns": list(columns), "states": states}, written, unchanged
+
+def prune(out_dir, keep):
+    """Deletes shard files not in `keep` (paths relative to out_dir). Returns how many were removed."""
+    removed = 0
+    root = os.path.join(out_dir, SHARD_DIR)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if os.path.relpath(path, out_dir).replace(os.sep, "/") not in keep:
+                os.remove(path)
+                removed += 1
+    return removed
+
+def export(out_dir, data):
+    """Writes every dataset's shards and the manifest. Returns (manifest, written, unchanged, pruned)."""
+    previous = load_manifest(out_dir)
+    manifest = {"version": 1, "datasets": {}}
+    written = unchanged = 0
+    for dataset, (columns, grouped) in data.items():
+        entry, dataset_written, dataset_unchanged = export_dataset(out_dir, dataset, columns, grouped)
+        manifest["datasets"][dataset] = entry
+        written += dataset_written
+        unchanged += dataset_unchanged
+        print(f"[*] {dataset}: {len(grouped)} shards ({dataset_written} written, {dataset_unchanged} unchanged)")
+
+    if manifest != previous:
+        path = os.path.join(out_dir, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    pruned = prune(out_dir, manifest_files(manifest) | manifest_files(previous))
+    return manifest, written, unchanged, pruned
+
+def main():
+    parser = argparse.ArgumentParser(description="Export per-state, content-hashed data shards for static hosting.")
+    parser.add_argument("--output", default=DATA_DIR)
+    parser.add_argument("--attorneys", help="Scraper output to include as the attorneys dataset")
+    parser.add_argument("--feeds-per-location", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated scanner data")
+    args = parser.parse_args()
+
+    manifest, written, unchanged, pruned = export(args.output, datasets(args.attorneys, args.feeds_per_location, args.seed))
+    total = sum(len(dataset["states"]) for dataset in manifest["datasets"].values())
+    print(f"[+] {total} shards in {args.output}: {written} written, {unchanged} unchanged, {pruned} stale files pruned")
+
+if __name__ == "__main__":
+    main()
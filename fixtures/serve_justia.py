@@ -0,0 +1,99 @@
+import argparse
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-in for the Justia listing pages, serving the recorded HTML in
+# fixtures/justia/ so the scraper can be exercised without touching the site.
+#
+#   python fixtures/serve_justia.py --pages 5
+#   python fixtures/serve_justia.py --throttle 4   # every 4th request gets a 429
+#   python scrape_attorneys.py --base-url http://127.0.0.1:8765/lawyers/civil-rights/south-carolina
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "justia")
+LISTING_PAGE = os.path.join(FIXTURE_DIR, "civil-rights-listing.html")
+EMPTY_PAGE = os.path.join(FIXTURE_DIR, "empty-listing.html")
+LAST_MODIFIED = "Mon, 05 Jan 2026 08:00:00 GMT"
+
+def load_fixture(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def make_handler(pages, throttle_every=0, retry_after=1):
+    listing = load_fixture(LISTING_PAGE)
+    empty = load_fixture(EMPTY_PAGE)
+    requests = {"count": 0}
+    lock = threading.Lock()
+
+    class JustiaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+        def do_GET(self):
+            with lock:
+                requests["count"] += 1
+                throttled = throttle_every and requests["count"] % throttle_every == 0
+            if throttled:
+                self.send_response(429)
+                self.send_header("Retry-After", str(retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            query = parse_qs(urlparse(self.path).query)
+            try:
+                page = int(query.get("page", ["1"])[0])
+            except ValueError:
+                page = 1
+
+            body = listing if page <= pages else empty
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return JustiaHandler
+
+def start_server(pages=5, host="127.0.0.1", port=0, throttle_every=0):
+    """Serves the fixtures on a background thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(pages, throttle_every))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{host}:{server.server_address[1]}/lawyers/civil-rights/south-carolina"
+    return server, base_url
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded Justia listing pages locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=5, help="Pages with listings before the empty page")
+    parser.add_argument("--throttle", type=int, default=0, metavar="N",
+                        help="Answer every Nth request with 429 and Retry-After, to exercise backoff")
+    parser.add_argument("--retry-after", type=int, default=1, metavar="SECONDS")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.pages, args.throttle, args.retry_after))
+    print(f"[*] Serving {args.pages} recorded pages on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+
+# On-disk response cache for listing pages.
+#
+# Bodies and parsed records are stored content-addressed under objects/ (so
+# pages with identical content share one blob), and index.json maps each URL
+# to its blobs plus the ETag/Last-Modified validators. The scraper sends
+# those validators back as If-None-Match/If-Modified-Since; on a 304, or a
+# 200 whose body hashes the same as before, the cached records are reused
+# and the page is not parsed again.
+
+CACHE_DIR = ".scrape_cache"
+MAX_AGE_DAYS = 30
+MAX_SIZE_MB = 512  # Uncompressed bodies + records; blobs are gzipped on disk
+INDEX_SAVE_EVERY = 50  # Stores between index writes; the index is always written on close
+RECORDS_FORMAT = 1  # Bump when parse_attorney's output changes so cached records are re-parsed
+
+class ResponseCache:
+    """Content-addressed page cache with validator revalidation and LRU/age eviction."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_age_days=MAX_AGE_DAYS, max_size_mb=MAX_SIZE_MB):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.max_age = max_age_days * 86400
+        self.max_size = max_size_mb * 1024 * 1024
+        self.stats = {"hits": 0, "not_modified": 0, "misses": 0, "stores": 0, "evictions": 0,
+                      "bytes_downloaded": 0, "bytes_saved": 0}
+        self._unsaved = 0
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+        self._expire()
+
+    # --- blobs ---
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _put(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_path, path)
+        return digest
+
+    def _get(self, digest):
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return gzip.decompress(f.read())
+        except FileNotFoundError:
+            return None
+
+    # --- lookups ---
+
+    def conditional_headers(self, url):
+        """Validators to send with a request for `url`, if it has been cached."""
+        entry = self.index.get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body(self, url):
+        entry = self.index.get(url)
+        data = self._get(entry["body"]) if entry else None
+        return data.decode('utf-8') if data is not None else None
+
+    def cached_records(self, url, state, status, body=None):
+        """Returns the stored records when the page is known unchanged, else None.
+
+        A page is unchanged when the server answered 304, or when a 200 body
+        hashes to the stored body.
+        """
+        entry = self.index.get(url)
+        body_hash = None
+        if body is not None:
+            body_bytes = body.encode('utf-8')
+            body_hash = hashlib.sha256(body_bytes).hexdigest()
+            self.stats["bytes_downloaded"] += len(body_bytes)
+
+        records = None
+        unchanged = entry and (status == 304 or body_hash == entry["body"])
+        if unchanged and entry.get("state") == state and entry.get("format") == RECORDS_FORMAT:
+            data = self._get(entry["records"])
+            records = json.loads(data) if data is not None else None
+        if records is None:
+            self.stats["misses"] += 1
+            return None
+
+        entry["accessed_at"] = time.time()
+        if status == 304:
+            entry["stored_at"] = entry["accessed_at"]  # revalidated, so the age clock restarts
+            self.stats["not_modified"] += 1
+            self.stats["bytes_saved"] += entry["size"]
+        self.stats["hits"] += 1
+        return records
+
+    def store(self, url, body, headers, records, state):
+        body_bytes = body.encode('utf-8')
+        records_bytes = json.dumps(records, ensure_ascii=False).encode('utf-8')
+        now = time.time()
+        self.index[url] = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "body": self._put(body_bytes),
+            "records": self._put(records_bytes),
+            "size": len(body_bytes) + len(records_bytes),
+            "state": state,
+            "format": RECORDS_FORMAT,
+            "stored_at": now,
+            "accessed_at": now,
+        }
+        self.stats["stores"] += 1
+        self._unsaved += 1
+        if self._unsaved >= INDEX_SAVE_EVERY:
+            self.save()
+
+    # --- housekeeping ---
+
+    def _expire(self):
+        cutoff = time.time() - self.max_age
+        for url in [url for url, entry in self.index.items() if entry["stored_at"] < cutoff]:
+            del self.index[url]
+            self.stats["evictions"] += 1
+
+    def _evict_to_size(self):
+        total = sum(entry["size"] for entry in self.index.values())
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]["accessed_at"]):
+            if total <= self.max_size:
+                break
+            total -= entry["size"]
+            del self.index[url]
+            self.stats["evictions"] += 1
+
+    def _collect_garbage(self):
+        """Deletes blobs no longer referenced by any index entry."""
+        live = set()
+        for entry in self.index.values():
+            live.add(entry["body"])
+            live.add(entry["records"])
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if prefix + name not in live:
+                    os.remove(os.path.join(prefix_dir, name))
+
+    def save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+        self._unsaved = 0
+
+    def close(self):
+        self._expire()
+        self._evict_to_size()
+        self.save()
+        self._collect_garbage()
+
+    def summary(self):
+        s = self.stats
+        lookups = s["hits"] + s["misses"]
+        rate = s["hits"] / lookups * 100 if lookups else 0
+        return (f"{s['hits']} hits ({s['not_modified']} not modified), {s['misses']} misses, {rate:.0f}% hit rate, "
+                f"{s['bytes_downloaded'] / 1024:.0f} KB downloaded, {s['bytes_saved'] / 1024:.0f} KB saved, "
+                f"{s['evictions']} evicted")
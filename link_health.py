@@ -0,0 +1,468 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from rate_control import MIN_INTERVAL, THROTTLE_STATUSES, RateController, parse_retry_after
+from script_imports import generator
+
+scanners_and_foia = generator("generate_scanners_and_foia")
+
+# Link health checker for public.scanner_links and public.foia_agencies.
+#
+# Rows are read from INSERT migrations (such as the one
+# generate_scanners_and_foia.py writes), COPY fixtures from its --format copy,
+# or CSV exports with a header row, e.g.
+#
+#   \copy (SELECT id, scanner_name, state, broadcastify_url, is_active FROM public.scanner_links) TO 'scanner_links.csv' CSV HEADER
+#
+# Every *_url column is probed with HEAD, falling back to GET when the HEAD
+# fails or is refused, through one pooled session with a cap on concurrent
+# requests per domain. For *email columns only the domain is checked, by
+# resolving it (the standard library has no MX lookup).
+#
+# Results are cached in .link_health_cache.json. Healthy links are skipped
+# until they are older than --ttl-days; failed and inconclusive ones (429,
+# 401/403 bot walls) are probed again on every run. A row is marked inactive
+# only after one of its links has failed --fail-runs runs in a row, and
+# active again as soon as every link checks out.
+#
+#   python link_health.py supabase/migrations/20260118010000_scanners_and_foia_seed.sql
+#   python link_health.py copy_fixtures/scanners_and_foia/*.tsv --per-domain 2
+#   python link_health.py scanner_links.csv foia_agencies.csv --updates link_health_updates.sql
+#
+# Writes link_health.csv, one line per checked link with its result, and
+# with --updates the UPDATE statements that bring is_active in line.
+
+CACHE_FILE = ".link_health_cache.json"
+STATUS_FILE = "link_health.csv"
+UPDATES_FILE = "link_health_updates.sql"
+TTL_DAYS = 7  # Healthy results are trusted this long
+FAIL_RUNS = 2  # Consecutive failed runs before a row is marked inactive
+CONCURRENCY = 100  # Requests in flight across all domains
+PER_DOMAIN = 4  # Requests in flight per domain
+REQUEST_TIMEOUT = 15
+CONNECT_TIMEOUT = 5
+DNS_TIMEOUT = 5
+MAX_REDIRECTS = 10
+CACHE_SAVE_EVERY = 500  # Results between cache writes; the cache is always written at the end
+USER_AGENT = "Mozilla/5.0 (compatible; CivilRightsHubLinkCheck/1.0)"
+
+TABLES = {"scanner_links": scanners_and_foia.SCANNER_COLUMNS, "foia_agencies": scanners_and_foia.FOIA_COLUMNS}
+NAME_COLUMNS = {"scanner_links": "scanner_name", "foia_agencies": "name"}
+BLOCKED_STATUSES = {401, 403}  # Often bot walls; the page may well exist
+
+OK = "ok"
+BROKEN = "broken"  # The server answered, with an error status
+UNREACHABLE = "unreachable"  # DNS, connection or timeout failures
+THROTTLED = "throttled"
+BLOCKED = "blocked"
+FAILED = {BROKEN, UNREACHABLE}
+
+STATUS_COLUMNS = ("table", "id", "name", "state", "column", "target", "result", "http_status", "method",
+                  "final_url", "error", "ms", "checked_at", "failures", "is_active", "suggested_active")
+
+# --- INPUT ---
+
+_INSERT = re.compile(r"INSERT\s+INTO\s+(?:public\.)?(scanner_links|foia_agencies)\s*\(([^)]*)\)\s*VALUES", re.I)
+
+def _skip_space(text, pos):
+    """Skips whitespace and -- comments."""
+    while pos < len(text):
+        if text[pos].isspace():
+            pos += 1
+        elif text.startswith("--", pos):
+            end = text.find("\n", pos)
+            pos = len(text) if end == -1 else end + 1
+        else:
+            break
+    return pos
+
+def _sql_value(raw):
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == "'" and raw[-1] == "'":
+        return raw[1:-1].replace("''", "'")
+    if raw.upper() == "NULL":
+        return None
+    if raw.lower() in ("true", "false"):
+        return raw.lower() == "true"
+    return raw  # Numbers and expressions are kept as written
+
+def _sql_tuple(text, pos):
+    """Parses the parenthesized tuple at `pos`. Returns (values, position after it)."""
+    values = []
+    depth = 0
+    start = pos + 1
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if ch == "'":
+            i += 1
+            while i < len(text):
+                if text[i] == "'":
+                    if text.startswith("''", i):
+                        i += 2
+                        continue
+                    break
+                i += 1
+        elif ch in "([":
+            depth += 1
+        elif ch in ")]" and depth:
+            depth -= 1
+        elif ch == "," and not depth:
+            values.append(_sql_value(text[start:i]))
+            start = i + 1
+        elif ch == ")":
+            values.append(_sql_value(text[start:i]))
+            return values, i + 1
+        i += 1
+    raise ValueError("unterminated VALUES tuple")
+
+def read_sql_file(path):
+    """Yields (table, row dict) for every scanner_links/foia_agencies row in INSERT ... VALUES statements."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    for match in _INSERT.finditer(text):
+        table = match.group(1).lower()
+        columns = [column.strip().strip('"') for column in match.group(2).split(",")]
+        pos = _skip_space(text, match.end())
+        while pos < len(text) and text[pos] == "(":
+            values, pos = _sql_tuple(text, pos)
+            yield table, dict(zip(columns, values))
+            pos = _skip_space(text, pos)
+            if pos < len(text) and text[pos] == ",":
+                pos = _skip_space(text, pos + 1)
+
+_COPY_UNESCAPES = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r"}
+
+def _copy_field(value):
+    if value == "\\N":
+        return None
+    return re.sub(r"\\[\\tnr]", lambda m: _COPY_UNESCAPES[m.group()], value)
+
+def _table_for(path, columns=()):
+    name = os.path.basename(path)
+    for table in TABLES:
+        if name.startswith(table):
+            return table
+    if "broadcastify_url" in columns:
+        return "scanner_links"
+    if "foia_email" in columns or "agency_type" in columns:
+        return "foia_agencies"
+    raise SystemExit(f"[!] Can't tell which table {path} holds; name it scanner_links*.csv or foia_agencies*.csv")
+
+def read_copy_file(path):
+    """Yields (table, row dict) from a COPY text fixture; the table comes from the file name."""
+    table = _table_for(path)
+    columns = TABLES[table]
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = [_copy_field(field) for field in line.rstrip("\n").split("\t")]
+            yield table, dict(zip(columns, fields))
+
+def read_csv_file(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        table = _table_for(path, reader.fieldnames or ())
+        for row in reader:
+            yield table, {column: (value if value != "" else None) for column, value in row.items()}
+
+def read_rows(paths):
+    for path in paths:
+        if path.endswith(".sql"):
+            yield from read_sql_file(path)
+        elif path.endswith(".csv"):
+            yield from read_csv_file(path)
+        else:
+            yield from read_copy_file(path)
+
+def email_domain(value):
+    _, _, domain = value.strip().rpartition("@")
+    return domain.lower().rstrip(".") or None
+
+def targets(row):
+    """(column, value, cache key) for each link in a row: *_url columns by HTTP, *email columns by DNS."""
+    found = []
+    for column, value in row.items():
+        if not isinstance(value, str) or not value.strip():
+            continue
+        if column.endswith("_url") and urlparse(value.strip()).scheme in ("http", "https"):
+            found.append((column, value.strip(), value.strip()))
+        elif column.endswith("email") and "@" in value:
+            domain = email_domain(value)
+            if domain:
+                found.append((column, value.strip(), f"dns:{domain}"))
+    return found
+
+# --- CACHE ---
+
+class ResultCache:
+    """Probe results by target, with a TTL for healthy ones and a run count for failing ones."""
+
+    def __init__(self, path=CACHE_FILE, ttl_days=TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.entries = {}
+        self._unsaved = 0
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+
+    def fresh(self, key, now=None):
+        """True when `key` was healthy within the TTL, so it needn't be probed again."""
+        entry = self.entries.get(key)
+        now = now or time.time()
+        return bool(entry) and entry["result"] == OK and now - entry["checked_at"] < self.ttl
+
+    def record(self, key, result):
+        previous = self.entries.get(key, {})
+        if result["result"] in FAILED:
+            result["failures"] = previous.get("failures", 0) + 1
+        elif result["result"] == OK:
+            result["failures"] = 0
+        else:
+            result["failures"] = previous.get("failures", 0)  # Inconclusive; keep the count
+        self.entries[key] = result
+        self._unsaved += 1
+        if self._unsaved >= CACHE_SAVE_EVERY:
+            self.save()
+
+    def save(self):
+        if not self.path or not self._unsaved:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+# --- PROBES ---
+
+def classify(status):
+    if 200 <= status < 400:
+        return OK
+    if status in THROTTLE_STATUSES:
+        return THROTTLED
+    if status in BLOCKED_STATUSES:
+        return BLOCKED
+    return BROKEN
+
+class LinkChecker:
+    """Pooled HEAD/GET prober that caps in-flight requests per domain.
+
+    Use as an async context manager. Request starts are paced per domain by
+    a RateController, which also honors Retry-After. Each target is probed
+    once per run; throttled answers are recorded as inconclusive rather
+    than retried, and the next run tries them again.
+    """
+
+    def __init__(self, concurrency=CONCURRENCY, per_domain=PER_DOMAIN, timeout=REQUEST_TIMEOUT,
+                 min_interval=MIN_INTERVAL):
+        self.concurrency = concurrency
+        self.per_domain = per_domain
+        self.timeout = timeout
+        self.rate = RateController(min_interval)
+        self.session = None
+        self._domain_slots = {}
+        self._dns_slots = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_domain, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=CONNECT_TIMEOUT),
+            headers={"User-Agent": USER_AGENT},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def _slot(self, domain):
+        if domain not in self._domain_slots:
+            self._domain_slots[domain] = asyncio.Semaphore(self.per_domain)
+        return self._domain_slots[domain]
+
+    async def _request(self, method, url):
+        # Headers are all a check needs; leaving the block without reading a GET body drops the connection
+        async with self.session.request(method, url, allow_redirects=True, max_redirects=MAX_REDIRECTS) as response:
+            return response.status, str(response.url), response.headers.get("Retry-After")
+
+    async def check_url(self, url):
+        domain = (urlparse(url).hostname or "").lower()
+        async with self._slot(domain):
+            await self.rate.wait(domain)
+            start = time.perf_counter()
+            method = "HEAD"
+            try:
+                try:
+                    status, final_url, retry_after = await self._request("HEAD", url)
+                except (aiohttp.ClientConnectorError, asyncio.TimeoutError):
+                    raise
+                except aiohttp.ClientError:
+                    status = None  # Some servers drop or garble HEAD; GET decides
+                if status is None or (classify(status) != OK and status not in THROTTLE_STATUSES):
+                    method = "GET"
+                    status, final_url, retry_after = await self._request("GET", url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.rate.on_error(domain)
+                return {"result": UNREACHABLE, "http_status": None, "method": method, "final_url": None,
+                        "error": str(e) or type(e).__name__, "ms": round((time.perf_counter() - start) * 1000, 1),
+                        "checked_at": time.time()}
+            latency = time.perf_counter() - start
+            self.rate.on_response(domain, status, latency, parse_retry_after(retry_after))
+        return {"result": classify(status), "http_status": status, "method": method,
+                "final_url": final_url if final_url != url else None, "error": None,
+                "ms": round(latency * 1000, 1), "checked_at": time.time()}
+
+    async def check_domain(self, domain):
+        async with self._dns_slots:
+            start = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                await asyncio.wait_for(loop.getaddrinfo(domain, None), DNS_TIMEOUT)
+            except (OSError, asyncio.TimeoutError) as e:
+                result, error = UNREACHABLE, str(e) or type(e).__name__
+            else:
+                result, error = OK, None
+        return {"result": result, "http_status": None, "method": "DNS", "final_url": None, "error": error,
+                "ms": round((time.perf_counter() - start) * 1000, 1), "checked_at": time.time()}
+
+    async def check(self, key):
+        if key.startswith("dns:"):
+            return await self.check_domain(key[len("dns:"):])
+        return await self.check_url(key)
+
+async def probe(keys, cache, concurrency=CONCURRENCY, per_domain=PER_DOMAIN, timeout=REQUEST_TIMEOUT,
+                min_interval=MIN_INTERVAL):
+    """Probes `keys`, recording each result in `cache` as it lands. Returns {result: count}."""
+    counts = {}
+
+    async def check(checker, key):
+        result = await checker.check(key)
+        cache.record(key, result)
+        counts[result["result"]] = counts.get(result["result"], 0) + 1
+        done = sum(counts.values())
+        if done % 100 == 0 or done == len(keys):
+            print(f"[*] Probed {done}/{len(keys)} ({', '.join(f'{r} {n}' for r, n in sorted(counts.items()))})")
+
+    async with LinkChecker(concurrency, per_domain, timeout, min_interval) as checker:
+        await asyncio.gather(*(check(checker, key) for key in keys))
+    print(f"[*] Pacing: {checker.rate.summary()}")
+    return counts
+
+# --- OUTPUT ---
+
+def suggested_active(entries, fail_runs=FAIL_RUNS):
+    """True when every link is healthy, False when one has failed `fail_runs` runs running, else None."""
+    if any(entry["result"] in FAILED and entry["failures"] >= fail_runs for entry in entries):
+        return False
+    if all(entry["result"] == OK for entry in entries):
+        return True
+    return None
+
+def _bool(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    return str(value).strip().lower() in ("t", "true", "1", "yes")
+
+def status_rows(rows, cache, fail_runs=FAIL_RUNS):
+    """Yields (status line dict, table, row, suggested is_active) for every row with links."""
+    for table, row in rows:
+        links = targets(row)
+        if not links:
+            continue
+        entries = [cache.entries[key] for _, _, key in links]
+        suggested = suggested_active(entries, fail_runs)
+        current = _bool(row.get("is_active"))
+        for (column, value, _), entry in zip(links, entries):
+            line = {"table": table, "id": row.get("id"), "name": row.get(NAME_COLUMNS[table]), "state": row.get("state"),
+                    "column": column, "target": value, "is_active": current, "suggested_active": suggested}
+            line.update({field: entry.get(field) for field in STATUS_COLUMNS if field in entry})
+            line["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(entry["checked_at"]))
+            yield line, table, row, suggested
+
+def update_sql(table, row, active):
+    """UPDATE for one row, keyed by id when the input had one, else by its identifying columns."""
+    if row.get("id"):
+        where = f"id = {scanners_and_foia.escape_sql(str(row['id']))}"
+    elif table == "scanner_links" and row.get("broadcastify_url"):
+        where = f"broadcastify_url = {scanners_and_foia.escape_sql(row['broadcastify_url'])}"
+    else:
+        name_column = NAME_COLUMNS[table]
+        state = f"state = {scanners_and_foia.escape_sql(row['state'])}" if row.get("state") else "state IS NULL"
+        where = f"{name_column} = {scanners_and_foia.escape_sql(row[name_column])} AND {state}"
+    return f"UPDATE public.{table} SET is_active = {str(active).lower()} WHERE {where};"
+
+def write_status(path, updates_path, rows, cache, fail_runs=FAIL_RUNS):
+    """Writes the status table, and the is_active UPDATEs when `updates_path` is set. Returns (lines, updates)."""
+    lines = 0
+    updates = {}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, STATUS_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for line, table, row, suggested in status_rows(rows, cache, fail_runs):
+            writer.writerow(line)
+            lines += 1
+            if suggested is not None and suggested != line["is_active"]:
+                statement = update_sql(table, row, suggested)
+                updates[statement] = None  # A row with several links is updated once
+    os.replace(tmp_path, path)
+
+    if updates_path:
+        tmp_path = f"{updates_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("-- LINK HEALTH is_active UPDATES - GENERATED BY link_health.py\n")
+            f.write("BEGIN;\n")
+            for statement in updates:
+                f.write(f"{statement}\n")
+            f.write("COMMIT;\n")
+        os.replace(tmp_path, updates_path)
+    return lines, len(updates)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check scanner and FOIA agency links and suggest is_active flips.")
+    parser.add_argument("inputs", nargs="+", help="INSERT migrations (.sql), COPY fixtures (.tsv) or CSV exports")
+    parser.add_argument("--output", default=STATUS_FILE, help="Status table, one CSV line per checked link")
+    parser.add_argument("--updates", nargs="?", const=UPDATES_FILE, metavar="PATH",
+                        help=f"Also write is_active UPDATE statements (default path {UPDATES_FILE})")
+    parser.add_argument("--cache", default=CACHE_FILE, help="Result cache carried between runs")
+    parser.add_argument("--ttl-days", type=float, default=TTL_DAYS, help="Re-probe healthy links older than this")
+    parser.add_argument("--fail-runs", type=int, default=FAIL_RUNS,
+                        help="Consecutive failed runs before a row is suggested inactive")
+    parser.add_argument("--force", action="store_true", help="Probe every link, ignoring the cache's TTL")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Requests in flight across all domains")
+    parser.add_argument("--per-domain", type=int, default=PER_DOMAIN, help="Requests in flight per domain")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, metavar="SECONDS")
+    parser.add_argument("--min-interval", type=float, default=MIN_INTERVAL, metavar="SECONDS",
+                        help="Politeness floor between requests to a domain (0 for local fixtures)")
+    args = parser.parse_args()
+
+    rows = list(read_rows(args.inputs))
+    keys = {key for _, row in rows for _, _, key in targets(row)}
+    cache = ResultCache(args.cache, args.ttl_days)
+    now = time.time()
+    stale = sorted(key for key in keys if args.force or not cache.fresh(key, now))
+    print(f"[*] {len(rows)} rows, {len(keys)} distinct links; {len(stale)} to probe, {len(keys) - len(stale)} fresh in cache")
+
+    start = time.perf_counter()
+    try:
+        if stale:
+            asyncio.run(probe(stale, cache, args.concurrency, args.per_domain, args.timeout, args.min_interval))
+    finally:
+        cache.save()
+
+    lines, updates = write_status(args.output, args.updates, rows, cache, args.fail_runs)
+    print(f"[+] {lines} links checked in {time.perf_counter() - start:.1f}s -> {args.output}")
+    if args.updates:
+        print(f"[+] {updates} is_active changes -> {args.updates}")
+
+if __name__ == "__main__":
+    main()
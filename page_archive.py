@@ -0,0 +1,172 @@
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from attorney_parsers import DEFAULT_PARSER, PARSER_BACKENDS, parse_page
+from attorney_records import NDJSONSink
+
+# Append-only archive of raw listing pages, for re-parsing without a re-crawl.
+#
+# The archive is a WARC/1.1 file with one gzip member per record, the same
+# layout as .warc.gz files from other crawlers, so warcio and friends can
+# read it too. Each page is a "response" record whose block is the HTTP
+# response (status line, a few headers, body), plus X-Scrape-State and
+# X-Scrape-Page headers so records can be re-parsed with the right state.
+#
+# A sidecar index (<archive>.idx, one JSON line per record) holds each
+# record's byte offset and compressed length, so any page can be read with a
+# single seek. Pages are archived as decoded UTF-8, the same form the
+# response cache stores.
+#
+#   python scrape_attorneys.py --nationwide --archive
+#   python page_archive.py crawl_archive.warc.gz --output attorneys_us.reparsed.ndjson --jobs 8
+
+ARCHIVE_FILE = "crawl_archive.warc.gz"
+REPARSE_OUTPUT = "attorneys_reparsed.ndjson"
+PAGES_PER_TASK = 64
+KEPT_HEADERS = ("ETag", "Last-Modified", "Date")
+
+def index_path(path):
+    return f"{path}.idx"
+
+def _warc_date(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+def _http_block(status, headers, body_bytes):
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", "Content-Type: text/html; charset=utf-8"]
+    lines += [f"{name}: {headers[name]}" for name in KEPT_HEADERS if headers and headers.get(name)]
+    lines.append(f"Content-Length: {len(body_bytes)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + body_bytes
+
+class PageArchive:
+    """Appends pages to a .warc.gz archive and its offset index."""
+
+    def __init__(self, path=ARCHIVE_FILE):
+        self.path = path
+        self._archive = open(path, "ab")
+        self._index = open(index_path(path), "a", encoding="utf-8")
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, url, body, headers, state, page, status=200):
+        body_bytes = body.encode("utf-8")
+        block = _http_block(status, headers, body_bytes)
+        now = time.time()
+        digest = base64.b32encode(hashlib.sha1(body_bytes).digest()).decode("ascii")
+        warc_headers = [
+            "WARC/1.1",
+            "WARC-Type: response",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Date: {_warc_date(now)}",
+            f"WARC-Target-URI: {url}",
+            f"WARC-Payload-Digest: sha1:{digest}",
+            "Content-Type: application/http;msgtype=response",
+            f"X-Scrape-State: {state}",
+            f"X-Scrape-Page: {page}",
+            f"Content-Length: {len(block)}",
+        ]
+        record = ("\r\n".join(warc_headers) + "\r\n\r\n").encode("utf-8") + block + b"\r\n\r\n"
+        member = gzip.compress(record)
+
+        offset = self._archive.tell()
+        self._archive.write(member)
+        self._archive.flush()
+        entry = {"url": url, "state": state, "page": page, "status": status, "offset": offset,
+                 "length": len(member), "date": _warc_date(now)}
+        # The index line goes after the record, so an indexed record is always complete
+        self._index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._index.flush()
+        self.count += 1
+
+    def close(self):
+        self._archive.close()
+        self._index.close()
+
+# --- READING ---
+
+def load_index(path, latest=True):
+    """Index entries in archive order; with `latest`, only the newest record per URL."""
+    entries = []
+    with open(index_path(path), encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entries.append(json.loads(line))
+    if latest:
+        newest = {entry["url"]: i for i, entry in enumerate(entries)}
+        entries = [entry for i, entry in enumerate(entries) if newest[entry["url"]] == i]
+    return entries
+
+def read_record(f, entry):
+    """Returns (warc_headers, http_status, body_text) for one index entry."""
+    f.seek(entry["offset"])
+    record = gzip.decompress(f.read(entry["length"]))
+    head, _, block = record.partition(b"\r\n\r\n")
+    warc_headers = dict(line.split(": ", 1) for line in head.decode("utf-8").split("\r\n")[1:])
+    block = block[:int(warc_headers["Content-Length"])]
+    http_head, _, body = block.partition(b"\r\n\r\n")
+    status = int(http_head.split(b"\r\n", 1)[0].split(b" ")[1])
+    return warc_headers, status, body.decode("utf-8")
+
+def read_page(path, entry):
+    with open(path, "rb") as f:
+        return read_record(f, entry)[2]
+
+# --- RE-PARSE ---
+
+def _reparse_chunk(task):
+    """Process-pool worker: parses one chunk of archived pages, in order."""
+    path, entries, parser = task
+    records = []
+    with open(path, "rb") as f:
+        for entry in entries:
+            _, status, body = read_record(f, entry)
+            if status == 200:
+                records.extend(parse_page(body, entry["state"], parser))
+    return len(entries), records
+
+def _write_chunks(results, sink):
+    pages = 0
+    for done, records in results:
+        pages += done
+        sink.write_many(records)
+    return pages
+
+def reparse_archive(path, sink, parser=DEFAULT_PARSER, jobs=None, latest=True):
+    """Re-extracts every archived page into `sink`. Returns the number of pages parsed."""
+    entries = load_index(path, latest)
+    tasks = [(path, entries[i:i + PAGES_PER_TASK], parser) for i in range(0, len(entries), PAGES_PER_TASK)]
+    if jobs == 1:
+        return _write_chunks(map(_reparse_chunk, tasks), sink)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # map() yields in task order, so the output keeps the crawl order
+        return _write_chunks(pool.map(_reparse_chunk, tasks), sink)
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-parse archived listing pages without re-crawling.")
+    parser.add_argument("archive", nargs="?", default=ARCHIVE_FILE, help="Archive written by scrape_attorneys.py --archive")
+    parser.add_argument("--output", default=REPARSE_OUTPUT, help="NDJSON output (.gz to compress)")
+    parser.add_argument("--parser", default=DEFAULT_PARSER, choices=sorted(PARSER_BACKENDS))
+    parser.add_argument("--jobs", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--all-records", action="store_true",
+                        help="Parse every archived copy of a URL, not just the newest")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with NDJSONSink(args.output) as sink:
+        pages = reparse_archive(args.archive, sink, args.parser, args.jobs, latest=not args.all_records)
+    elapsed = time.perf_counter() - start
+    print(f"[+] Re-parsed {pages} pages into {sink.count} attorneys in {elapsed:.1f}s -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@
 
 const CACHE_NAME = "crh-v1";
 const OFFLINE_URL = "/offline.html";
+const DATA_CACHE_NAME = "crh-data";
+const DATA_SHARDS_PATH = "/data/shards/";
+const DATA_MANIFEST_PATH = "/data/manifest.json";
 
 // Pages that MUST work offline — critical for people being detained
 const PRECACHE_URLS = [
@@ -13,6 +16,24 @@ const PRECACHE_URLS = [
   "/offline.html",
 ];
 
+// Drop cached shards the manifest no longer lists, so replaced shards don't pile up
+async function pruneDataCache(manifest) {
+  const keep = new Set();
+  for (const dataset of Object.values(manifest.datasets || {})) {
+    for (const entry of Object.values(dataset.states || {})) keep.add(`/data/${entry.file}`);
+  }
+  const cache = await caches.open(DATA_CACHE_NAME);
+  const requests = await cache.keys();
+  await Promise.all(
+    requests
+      .filter((request) => {
+        const path = new URL(request.url).pathname;
+        return path.startsWith(DATA_SHARDS_PATH) && !keep.has(path);
+      })
+      .map((request) => cache.delete(request))
+  );
+}
+
 // Install: precache critical routes
 self.addEventListener("install", (event) => {
   event.waitUntil(
@@ -21,12 +42,17 @@ self.addEventListener("install", (event) => {
   self.skipWaiting();
 });
 
-// Activate: clean old caches
+// Activate: clean old caches, and shards the last fetched manifest dropped
 self.addEventListener("activate", (event) => {
   event.waitUntil(
-    caches.keys().then((keys) =>
-      Promise.all(keys.filter((k) => k !== CACHE_NAME).map((k) => caches.delete(k)))
-    )
+    caches
+      .keys()
+      .then((keys) =>
+        Promise.all(keys.filter((k) => k !== CACHE_NAME && k !== DATA_CACHE_NAME).map((k) => caches.delete(k)))
+      )
+      .then(() => caches.open(DATA_CACHE_NAME))
+      .then((cache) => cache.match(DATA_MANIFEST_PATH))
+      .then((manifest) => manifest && manifest.json().then(pruneDataCache))
   );
   self.clients.claim();
 });
@@ -40,6 +66,46 @@ self.addEventListener("fetch", (event) => {
   const url = new URL(event.request.url);
   if (url.hostname.includes("supabase")) return;
 
+  // Data manifest: network-first, kept for offline use; each fresh copy prunes the shard cache
+  if (url.pathname === DATA_MANIFEST_PATH) {
+    event.respondWith(
+      fetch(event.request)
+        .then((response) => {
+          if (response.ok) {
+            const forCache = response.clone();
+            const forPrune = response.clone();
+            event.waitUntil(
+              caches
+                .open(DATA_CACHE_NAME)
+                .then((cache) => cache.put(DATA_MANIFEST_PATH, forCache))
+                .then(() => forPrune.json())
+                .then(pruneDataCache)
+            );
+          }
+          return response;
+        })
+        .catch(() => caches.open(DATA_CACHE_NAME).then((cache) => cache.match(DATA_MANIFEST_PATH)))
+    );
+    return;
+  }
+
+  // Content-hashed data shards never change: serve from cache, fetch once
+  if (url.pathname.startsWith(DATA_SHARDS_PATH)) {
+    event.respondWith(
+      caches.open(DATA_CACHE_NAME).then((cache) =>
+        cache.match(event.request).then(
+          (cached) =>
+            cached ||
+            fetch(event.request).then((response) => {
+              if (response.ok) cache.put(event.request, response.clone());
+              return response;
+            })
+        )
+      )
+    );
+    return;
+  }
+
   event.respondWith(
     fetch(event.request)
       .then((response) => {
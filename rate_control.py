@@ -0,0 +1,115 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+# Adaptive request pacing for the scraper.
+#
+# Each host gets an interval between request starts that is adjusted AIMD
+# style, like TCP congestion control: every healthy response adds a little
+# to the request rate, and every throttling response (429/503), timeout or
+# slow response (over TARGET_LATENCY) multiplies the interval by
+# BACKOFF_FACTOR. The interval never drops below the politeness floor
+# (--min-interval), and a Retry-After header pauses the whole host until
+# the time it names.
+#
+# Transient failures are retried by FetchEngine with jittered exponential
+# backoff (backoff_delay); the controller only decides when the next request
+# to a host may start.
+
+MIN_INTERVAL = 0.5    # Politeness floor: at most 2 requests/sec per host
+START_INTERVAL = 1.0  # Where pacing starts before the host has answered anything
+MAX_INTERVAL = 60.0
+RATE_STEP = 0.1       # Requests/sec added per healthy response
+BACKOFF_FACTOR = 2.0  # Interval multiplier on throttling or slow responses
+TARGET_LATENCY = 3.0  # Seconds; slower responses count as congestion
+MAX_RETRY_AFTER = 600.0
+
+THROTTLE_STATUSES = {429, 503}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full-jitter exponential backoff: uniform over [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+class RateController:
+    """Per-host AIMD pacing of request starts.
+
+    With min_interval=0 pacing starts off (for local fixtures); throttling
+    responses still slow the host down and Retry-After is still honored.
+    """
+
+    def __init__(self, min_interval=MIN_INTERVAL, start_interval=START_INTERVAL, max_interval=MAX_INTERVAL,
+                 rate_step=RATE_STEP, backoff_factor=BACKOFF_FACTOR, target_latency=TARGET_LATENCY):
+        self.min_interval = min_interval
+        self.start_interval = max(min_interval, start_interval) if min_interval > 0 else 0.0
+        self.max_interval = max_interval
+        self.rate_step = rate_step
+        self.backoff_factor = backoff_factor
+        self.target_latency = target_latency
+        self._hosts = {}
+        self.throttled = 0
+        self.slow = 0
+
+    def _state(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = {"interval": self.start_interval, "next_start": 0.0, "blocked_until": 0.0}
+        return self._hosts[host]
+
+    def interval(self, host):
+        return self._state(host)["interval"]
+
+    async def wait(self, host):
+        """Waits for this request's start slot. Slots are reserved in call order."""
+        state = self._state(host)
+        now = time.monotonic()
+        start = max(now, state["next_start"], state["blocked_until"])
+        state["next_start"] = start + state["interval"]
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _speed_up(self, state):
+        if state["interval"] > 0:
+            rate = 1 / state["interval"] + self.rate_step
+            state["interval"] = max(self.min_interval, 1 / rate)
+
+    def _slow_down(self, state):
+        # From 0 (pacing off) jump to a small interval, then grow geometrically
+        state["interval"] = min(self.max_interval, max(state["interval"] * self.backoff_factor, self.min_interval, 0.1))
+
+    def on_response(self, host, status, latency, retry_after=None):
+        state = self._state(host)
+        if status in THROTTLE_STATUSES:
+            self.throttled += 1
+            self._slow_down(state)
+        elif latency > self.target_latency:
+            self.slow += 1
+            self._slow_down(state)
+        elif status < 500:
+            self._speed_up(state)
+        if retry_after:
+            state["blocked_until"] = max(state["blocked_until"], time.monotonic() + retry_after)
+
+    def on_error(self, host):
+        self._slow_down(self._state(host))
+
+    def summary(self):
+        intervals = ", ".join(f"{host} {state['interval']:.2f}s" for host, state in self._hosts.items())
+        return f"{self.throttled} throttled, {self.slow} slow responses; final intervals: {intervals or 'none'}"
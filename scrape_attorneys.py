@@ -1,111 +1,523 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 import json
-import time
+import os
 import random
+import sys
+import time
+from urllib.parse import urlparse
+
+import aiohttp
 from fake_useragent import UserAgent
 
+from attorney_dedup import dedup_file
+from attorney_parsers import DEFAULT_PARSER, PARSER_BACKENDS, CardStream, count_cards, etree, parse_page
+from attorney_records import NDJSONSink
+from crawl_metrics import LOG_FILE as METRICS_LOG, TEXTFILE as METRICS_TEXTFILE, CrawlMetrics, request_tracer
+from http_cache import CACHE_DIR, MAX_AGE_DAYS, MAX_SIZE_MB, ResponseCache
+from page_archive import ARCHIVE_FILE, PageArchive
+from rate_control import MAX_RETRIES, MIN_INTERVAL, RETRY_STATUSES, RateController, backoff_delay, parse_retry_after
+from script_imports import STATES, add_profile_argument, profiled
+
 # Configuration
-BASE_URL = "https://www.justia.com/lawyers/civil-rights/south-carolina"
-OUTPUT_FILE = "attorneys_sc.json"
+LISTING_URL = "https://www.justia.com/lawyers/civil-rights"
+BASE_URL = f"{LISTING_URL}/south-carolina"
+OUTPUT_FILE = "attorneys_sc.ndjson"
+NATIONWIDE_OUTPUT_FILE = "attorneys_us.ndjson"
+CHECKPOINT_FILE = "crawl_checkpoint.json"
 MAX_PAGES = 10  # Set higher for full scrape (e.g., 50)
+CONCURRENCY = 3  # Simultaneous requests per host
+REQUEST_TIMEOUT = 10
+UA_POOL_SIZE = 25
+FLUSH_EVERY = 100  # Records buffered before the output file is written
+STREAM_CHUNK = 16 * 1024  # Bytes read per step when --stream parses pages as they download
 
-def get_headers():
+_ua_pool = []
+
+def build_ua_pool(size=UA_POOL_SIZE):
+    """Draws a fixed set of user agents once; UserAgent() is too slow to build per request."""
     ua = UserAgent()
+    _ua_pool[:] = [ua.random for _ in range(size)]
+    return _ua_pool
+
+def get_headers():
+    if not _ua_pool:
+        build_ua_pool()
     return {
-        'User-Agent': ua.random,
+        'User-Agent': random.choice(_ua_pool),
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Referer': 'https://www.google.com/'
     }
 
-def parse_attorney(card):
-    """Extracts data from a single attorney card HTML element."""
+def page_url(base_url, page):
+    return f"{base_url}?page={page}" if page > 1 else base_url
+
+def state_url(listing_url, state):
+    return f"{listing_url}/{state.lower().replace(' ', '-')}"
+
+# --- FETCH ENGINE ---
+
+class StreamInterrupted(Exception):
+    """A streamed page failed after some of its records were emitted, so it cannot be retried."""
+
+class FetchEngine:
+    """Shared keep-alive HTTP client that caps in-flight requests per host.
+
+    Use as an async context manager; every fetch reuses the pooled connections
+    of a single aiohttp session. Request starts are paced per host by a
+    RateController, and transient failures are retried with backoff. With a
+    ResponseCache attached, requests carry the cached validators so unchanged
+    pages come back as 304s. With CrawlMetrics attached, requests are traced
+    for per-phase latency. With a PageArchive attached, listing pages are
+    archived for offline re-parsing. fetch() can hand a 200 response's body
+    to a push parser chunk by chunk instead of reading it whole.
+    """
+
+    def __init__(self, concurrency=CONCURRENCY, timeout=REQUEST_TIMEOUT, min_interval=MIN_INTERVAL, cache=None,
+                 metrics=None, max_retries=MAX_RETRIES, archive=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.rate = RateController(min_interval)
+        self.max_retries = max_retries
+        self.cache = cache
+        self.metrics = metrics
+        self.archive = archive
+        self.session = None
+        self._host_slots = {}
+
+    async def __aenter__(self):
+        if not _ua_pool:
+            build_ua_pool()
+        connector = aiohttp.TCPConnector(limit_per_host=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[request_tracer()] if self.metrics else None,
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def _slot(self, url):
+        host = urlparse(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.concurrency)
+        return self._host_slots[host]
+
+    async def _request(self, url, headers, timing, stream=None):
+        host = urlparse(url).netloc
+        async with self._slot(url):
+            await self.rate.wait(host)
+            if timing is not None:
+                timing.update(dns_ms=None, connect_ms=None)  # Stay null when a pooled connection is reused
+            start = time.perf_counter()
+            try:
+                async with self.session.get(url, headers=headers, trace_request_ctx=timing) as response:
+                    status = response.status
+                    response_headers = response.headers
+                    if stream is not None and status == 200:
+                        body = stream(response.charset or "utf-8")
+                        await self._feed(response, body)
+                        size = body.bytes
+                    else:
+                        raw = await response.read()
+                        body = await response.text()
+                        size = len(raw)
+            except Exception:
+                self.rate.on_error(host)
+                raise
+            latency = time.perf_counter() - start
+            self.rate.on_response(host, status, latency, parse_retry_after(response_headers.get("Retry-After")))
+        if timing is not None:
+            timing.update(status=status, bytes=size, total_ms=round(latency * 1000, 3))
+            if isinstance(body, CardStream) and body.first_record_at is not None:
+                timing["first_record_ms"] = round((body.first_record_at - start) * 1000, 3)
+        return status, body, response_headers
+
+    async def _feed(self, response, card_stream):
+        try:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK):
+                card_stream.feed(chunk)
+            card_stream.close()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if card_stream.records:
+                # Records already went out; a retry would emit them twice
+                raise StreamInterrupted(f"{str(e) or type(e).__name__} after {card_stream.records} records") from e
+            raise
+
+    async def fetch(self, url, revalidate=True, timing=None, stream=None):
+        """Returns (status, body_text, headers) of the last attempt.
+
+        429/5xx responses, timeouts and connection errors are retried up to
+        max_retries times with jittered exponential backoff, waiting at least
+        as long as Retry-After asks. A `timing` dict is filled with the last
+        attempt's latency phases, status and size, and the attempt count.
+
+        With `stream`, a callable taking the response charset and returning a
+        CardStream, a 200 body is fed to a fresh stream as it downloads and
+        the stream is returned in place of the text. A stream that fails
+        after emitting records raises StreamInterrupted instead of retrying.
+        """
+        headers = get_headers()
+        if self.cache and revalidate:
+            headers.update(self.cache.conditional_headers(url))
+
+        for attempt in range(self.max_retries + 1):
+            if timing is not None:
+                timing["attempts"] = attempt + 1
+            try:
+                status, body, response_headers = await self._request(url, headers, timing, stream)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                reason = str(e) or type(e).__name__
+            else:
+                if status not in RETRY_STATUSES or attempt == self.max_retries:
+                    return status, body, response_headers
+                retry_after = parse_retry_after(response_headers.get("Retry-After"))
+                delay = max(backoff_delay(attempt), retry_after or 0)
+                reason = f"Status {status}"
+            print(f"[!] {reason} from {url}; retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+# --- CRAWL ---
+
+async def fetch_listing_page(engine, base_url, page, state="South Carolina", parser=DEFAULT_PARSER):
+    """Fetches and parses one page.
+
+    Returns the page's records, an empty list when the listing has ended, or
+    None when the request failed.
+    """
+    url = page_url(base_url, page)
+    cache = engine.cache
+    metrics = engine.metrics
+    sample = {"state": state, "page": page, "url": url, "cache": "hit" if cache else "off"} if metrics else None
+    print(f"[*] Scraping {state} Page {page}...")
+    records = None
     try:
-        # Name
-        name_tag = card.find('strong', class_='name')
-        name = name_tag.get_text(strip=True) if name_tag else "Unknown"
-
-        # Firm
-        firm_tag = card.find('span', class_='law-firm-name')
-        firm = firm_tag.get_text(strip=True) if firm_tag else None
-
-        # Contact Info Block
-        phone_tag = card.find('a', class_=['phone', '-phone'])
-        phone = phone_tag.get_text(strip=True) if phone_tag else None
-
-        # Address (Often unstructured, grabbing snippet)
-        address_tag = card.find('span', class_='address')
-        address = address_tag.get_text(" ", strip=True) if address_tag else "South Carolina"
-
-        # Website / Profile Link
-        link_tag = name_tag.find_parent('a')
-        website = link_tag['href'] if link_tag else None
-
-        # Specialty tags (Grab secondary practice areas)
-        specialties = []
-        spec_block = card.find('div', class_='practices')
-        if spec_block:
-            specialties = [s.get_text(strip=True) for s in spec_block.find_all('a')]
-
-        return {
-            "name": name,
-            "firm": firm,
-            "phone": phone,
-            "address": address,
-            "website": website,
-            "specialties": specialties,
-            "state": "South Carolina",
-            "source": "Justia"
-        }
+        status, body, headers = await engine.fetch(url, timing=sample)
+        if cache and status in (200, 304):
+            records = cache.cached_records(url, state, status, body if status == 200 else None)
+            if records is None and status == 304:
+                # Validators matched but the stored records are unusable; fetch the page in full
+                status, body, headers = await engine.fetch(url, revalidate=False, timing=sample)
     except Exception as e:
-        print(f"[-] Error parsing card: {e}")
+        print(f"[!] Critical error on {state} page {page}: {e}")
+        if metrics:
+            sample["error"] = str(e) or type(e).__name__
+            metrics.record(sample)
         return None
 
-def scrape():
-    all_attorneys = []
-    
-    print(f"[*] Starting scrape of {BASE_URL}")
+    if records is None:
+        if status != 200:
+            print(f"[!] Failed to load {state} page {page}: Status {status}")
+            if metrics:
+                metrics.record(sample)
+            return None
 
-    for page in range(1, MAX_PAGES + 1):
-        url = f"{BASE_URL}?page={page}" if page > 1 else BASE_URL
-        print(f"[*] Scraping Page {page}...")
+        parse_start = time.perf_counter()
+        records = parse_page(body, state, parser)
+        if metrics:
+            parse_ms = round((time.perf_counter() - parse_start) * 1000, 3)
+            sample.update(parse_ms=parse_ms, cards=count_cards(body), cache="miss" if cache else "off")
+        if cache:
+            cache.store(url, body, headers, records, state)
 
-        try:
-            response = requests.get(url, headers=get_headers(), timeout=10)
-            
-            if response.status_code != 200:
-                print(f"[!] Failed to load page {page}: Status {response.status_code}")
-                break
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the main listing container
-            # Note: Class names can change; inspect Justia source if this breaks.
-            # Currently standard listing is div class="lawyer-card" or similar wrapper
-            cards = soup.find_all('div', class_='jcard') 
-
-            if not cards:
-                print("[!] No listings found on this page. Stopping.")
-                break
-
-            for card in cards:
-                data = parse_attorney(card)
-                if data:
-                    all_attorneys.append(data)
-
-            # Random sleep to behave like a human
-            sleep_time = random.uniform(2, 5)
-            time.sleep(sleep_time)
-
-        except Exception as e:
-            print(f"[!] Critical error on page {page}: {e}")
-            break
-
-    # Save to JSON
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_attorneys, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n[+] Scrape Complete. {len(all_attorneys)} attorneys saved to {OUTPUT_FILE}")
+    if engine.archive:
+        # A 304 has no body; archive the cached copy it confirmed
+        archived = body if status == 200 else cache.body(url)
+        if archived is not None:
+            engine.archive.append(url, archived, headers, state, page)
+
+    if metrics:
+        # Pages answered from the cache were not re-parsed; their cards are the stored records
+        sample.setdefault("cards", len(records))
+        sample["records"] = len(records)
+        metrics.record(sample)
+
+    if not records:
+        print(f"[!] No listings found on {state} page {page}. Stopping.")
+    return records
+
+async def stream_listing_page(engine, base_url, page, state, emit):
+    """Fetches one page through a CardStream, passing each record to `emit` as soon as its card has arrived.
+
+    Returns like fetch_listing_page. The page is never held whole, so it is
+    neither cached nor archived, and a page that fails part way through may
+    already have emitted some of its records.
+    """
+    url = page_url(base_url, page)
+    metrics = engine.metrics
+    sample = {"state": state, "page": page, "url": url, "cache": "off"} if metrics else None
+    print(f"[*] Scraping {state} Page {page}...")
+    records = []
+
+    def collect(record):
+        records.append(record)
+        emit(record)
+
+    try:
+        status, card_stream, _ = await engine.fetch(url, revalidate=False, timing=sample,
+                                                    stream=lambda encoding: CardStream(state, collect, encoding))
+    except Exception as e:
+        print(f"[!] Critical error on {state} page {page}: {e}")
+        if metrics:
+            sample["error"] = str(e) or type(e).__name__
+            metrics.record(sample)
+        return None
+
+    if status != 200:
+        print(f"[!] Failed to load {state} page {page}: Status {status}")
+        if metrics:
+            metrics.record(sample)
+        return None
+
+    if metrics:
+        sample.update(parse_ms=round(card_stream.parse_seconds * 1000, 3), cards=card_stream.cards,
+                      records=len(records))
+        metrics.record(sample)
+
+    if not records:
+        print(f"[!] No listings found on {state} page {page}. Stopping.")
+    return records
+
+async def crawl(sink, base_url=BASE_URL, max_pages=MAX_PAGES, engine=None, concurrency=CONCURRENCY,
+                min_interval=MIN_INTERVAL, state="South Carolina", parser=DEFAULT_PARSER, cache=None, metrics=None,
+                archive=None, stream=False):
+    """Crawls listing pages in windows of `concurrency` pages at a time, writing records to `sink`.
+
+    The page count is unknown up front, so the crawl stops after the first
+    window containing an empty or failed page; records from pages after that
+    page are discarded to keep the same result as a sequential crawl. With
+    `stream`, records are written as they are parsed instead, so those of a
+    later page in the window that failed are kept.
+    """
+    owns_engine = engine is None
+    if owns_engine:
+        engine = FetchEngine(concurrency=concurrency, min_interval=min_interval, cache=cache, metrics=metrics,
+                             archive=archive)
+        await engine.__aenter__()
+
+    try:
+        for start in range(1, max_pages + 1, concurrency):
+            window = range(start, min(start + concurrency, max_pages + 1))
+            if stream:
+                pages = (stream_listing_page(engine, base_url, p, state, sink.write) for p in window)
+            else:
+                pages = (fetch_listing_page(engine, base_url, p, state, parser) for p in window)
+            results = await asyncio.gather(*pages)
+            for records in results:
+                if not records:
+                    return sink.count
+                if not stream:
+                    sink.write_many(records)
+    finally:
+        if owns_engine:
+            await engine.__aexit__(None, None, None)
+            print(f"[*] Pacing: {engine.rate.summary()}")
+
+    return sink.count
+
+# --- NATIONWIDE CRAWL ---
+
+def load_checkpoint(path, states):
+    """Returns per-state progress, resumed from `path` when it exists."""
+    progress = {}
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            progress = json.load(f).get("states", {})
+        print(f"[*] Resuming from checkpoint {path}")
+
+    for state in states:
+        progress.setdefault(state, {"next_page": 1, "exhausted": False, "records": 0})
+    return progress
+
+def state_pending(entry, max_pages):
+    # Page-capped states reopen if a resumed run raises --max-pages
+    return not entry["exhausted"] and entry["next_page"] <= max_pages
+
+def save_checkpoint(path, progress):
+    # Write-then-rename so a crash mid-write never leaves a truncated checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"states": progress}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+async def crawl_states(sink, states, listing_url=LISTING_URL, max_pages=MAX_PAGES, workers=CONCURRENCY,
+                       concurrency=CONCURRENCY, min_interval=MIN_INTERVAL, checkpoint_path=CHECKPOINT_FILE,
+                       parser=DEFAULT_PARSER, cache=None, metrics=None, archive=None, stream=False):
+    """Crawls many states from a shared queue of (state, page) work units.
+
+    Each state starts with its first page queued; a page that returns
+    listings queues the state's next page. Records go to `sink` and are
+    flushed before progress is checkpointed after every page, so a crash
+    can at worst repeat one page's records on resume. A page that fails is
+    left as the state's next page so a resumed run retries it.
+    """
+    progress = load_checkpoint(checkpoint_path, states)
+    queue = asyncio.Queue()
+    for state in states:
+        if state_pending(progress[state], max_pages):
+            queue.put_nowait((state, progress[state]["next_page"]))
+
+    async def worker(engine):
+        while True:
+            state, page = await queue.get()
+            try:
+                base_url = state_url(listing_url, state)
+                if stream:
+                    records = await stream_listing_page(engine, base_url, page, state, sink.write)
+                else:
+                    records = await fetch_listing_page(engine, base_url, page, state, parser)
+                entry = progress[state]
+                if records is None:
+                    continue
+                if not stream:
+                    sink.write_many(records)
+                entry["records"] += len(records)
+                if records:
+                    entry["next_page"] = page + 1
+                    if state_pending(entry, max_pages):
+                        queue.put_nowait((state, page + 1))
+                else:
+                    entry["exhausted"] = True
+                sink.flush()
+                save_checkpoint(checkpoint_path, progress)
+            finally:
+                queue.task_done()
+
+    async with FetchEngine(concurrency=concurrency, min_interval=min_interval, cache=cache, metrics=metrics,
+                           archive=archive) as engine:
+        tasks = [asyncio.create_task(worker(engine)) for _ in range(workers)]
+        await queue.join()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    print(f"[*] Pacing: {engine.rate.summary()}")
+
+    return progress
+
+def scrape_nationwide(states=None, listing_url=LISTING_URL, max_pages=MAX_PAGES, output_file=NATIONWIDE_OUTPUT_FILE,
+                      workers=CONCURRENCY, concurrency=CONCURRENCY, min_interval=MIN_INTERVAL,
+                      checkpoint_path=CHECKPOINT_FILE, parser=DEFAULT_PARSER, cache=None, metrics=None, archive=None,
+                      stream=False):
+    states = states or [name for name, _ in STATES]
+    print(f"[*] Starting nationwide scrape of {len(states)} states from {listing_url}")
+
+    # Records from before a crash are already in the output; keep appending to it
+    resuming = os.path.exists(checkpoint_path)
+    with NDJSONSink(output_file, FLUSH_EVERY, append=resuming) as sink:
+        progress = asyncio.run(crawl_states(sink, states, listing_url, max_pages, workers, concurrency,
+                                            min_interval, checkpoint_path, parser, cache, metrics, archive, stream))
+    total = sum(progress[state]["records"] for state in states)
+
+    # Anything still pending after the queue drained had a failed page
+    unfinished = [state for state in states if state_pending(progress[state], max_pages)]
+    if unfinished:
+        print(f"[!] {len(unfinished)} states did not finish ({', '.join(unfinished)}). "
+              f"Re-run to resume from {checkpoint_path}.")
+    elif os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    print(f"\n[+] Scrape Complete. {total} attorneys saved to {output_file}")
+
+def scrape(base_url=BASE_URL, max_pages=MAX_PAGES, output_file=OUTPUT_FILE, concurrency=CONCURRENCY, min_interval=MIN_INTERVAL,
+           parser=DEFAULT_PARSER, cache=None, metrics=None, archive=None, stream=False):
+    print(f"[*] Starting scrape of {base_url}")
+
+    with NDJSONSink(output_file, FLUSH_EVERY) as sink:
+        total = asyncio.run(crawl(sink, base_url, max_pages, concurrency=concurrency, min_interval=min_interval,
+                                  parser=parser, cache=cache, metrics=metrics, archive=archive, stream=stream))
+
+    print(f"\n[+] Scrape Complete. {total} attorneys saved to {output_file}")
+
+def run(args, nationwide, output_file):
+    # Streamed pages are never held whole, so there is nothing to cache
+    cache = None if args.no_cache or args.stream else ResponseCache(args.cache_dir, args.cache_max_age, args.cache_max_size)
+    metrics = None
+    if args.metrics_log or args.metrics_textfile:
+        metrics = CrawlMetrics(args.metrics_log, args.metrics_textfile)
+    archive = PageArchive(args.archive) if args.archive else None
+    try:
+        if nationwide:
+            if args.fresh and os.path.exists(args.checkpoint):
+                os.remove(args.checkpoint)
+            scrape_nationwide(args.states, args.listing_url, args.max_pages, output_file,
+                              args.workers, args.concurrency, args.min_interval, args.checkpoint, args.parser, cache,
+                              metrics, archive, args.stream)
+        else:
+            scrape(args.base_url, args.max_pages, output_file, args.concurrency, args.min_interval, args.parser, cache,
+                   metrics, archive, args.stream)
+    finally:
+        if cache:
+            cache.close()
+            print(f"[*] Cache: {cache.summary()}")
+        if metrics:
+            metrics.close()
+            print(f"[*] Metrics: {metrics.summary()}")
+        if archive:
+            archive.close()
+            print(f"[*] Archived {archive.count} pages to {archive.path}")
+
+    if args.dedup:
+        kept, merged = dedup_file(output_file, output_file)
+        print(f"[+] Dedup: {kept} unique attorneys ({merged} duplicates merged)")
+
+def profile_stages():
+    """Functions timed by --profile: page fetches, parsing, record serialization and output writes."""
+    module = sys.modules[__name__]
+    return [(FetchEngine, "fetch", "fetch"), (module, "parse_page", "parse"), (CardStream, "feed", "parse"),
+            (CardStream, "close", "parse"), (NDJSONSink, "write", "serialize"), (NDJSONSink, "flush", "write")]
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape civil rights attorneys from Justia listings.")
+    parser.add_argument("--base-url", default=BASE_URL, help="Listing URL (point at fixtures/serve_justia.py for local runs)")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Simultaneous requests per host")
+    parser.add_argument("--min-interval", type=float, default=MIN_INTERVAL, metavar="SECONDS",
+                        help="Politeness floor between requests to a host; pacing adapts above it (0 for local fixtures)")
+    parser.add_argument("--output", help=f"NDJSON file; defaults to {OUTPUT_FILE}, or {NATIONWIDE_OUTPUT_FILE} with --nationwide")
+    parser.add_argument("--parser", default=DEFAULT_PARSER, choices=sorted(PARSER_BACKENDS),
+                        help="HTML parser backend")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse pages with the lxml push parser as they download, writing each record as its card "
+                             "arrives (no page cache or archive)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="On-disk page cache for conditional revalidation")
+    parser.add_argument("--no-cache", action="store_true", help="Download and parse every page")
+    parser.add_argument("--cache-max-age", type=float, default=MAX_AGE_DAYS, metavar="DAYS")
+    parser.add_argument("--cache-max-size", type=float, default=MAX_SIZE_MB, metavar="MB")
+    parser.add_argument("--dedup", action="store_true", help="Merge duplicate attorneys in the output after the crawl")
+    parser.add_argument("--compress", action="store_true", help="Gzip the output as it is written (adds .gz)")
+    parser.add_argument("--archive", nargs="?", const=ARCHIVE_FILE, metavar="PATH",
+                        help=f"Append raw listing pages to a .warc.gz archive for page_archive.py (default path {ARCHIVE_FILE})")
+    parser.add_argument("--metrics-log", nargs="?", const=METRICS_LOG, metavar="PATH",
+                        help=f"Append per-page request metrics as JSON lines (default path {METRICS_LOG})")
+    parser.add_argument("--metrics-textfile", nargs="?", const=METRICS_TEXTFILE, metavar="PATH",
+                        help=f"Write a Prometheus textfile with latency percentiles (default path {METRICS_TEXTFILE})")
+    add_profile_argument(parser)
+
+    nationwide = parser.add_argument_group("nationwide crawl")
+    nationwide.add_argument("--nationwide", action="store_true", help="Crawl every state from a shared work queue")
+    nationwide.add_argument("--states", nargs="+", metavar="STATE", help="Limit the nationwide crawl to these states")
+    nationwide.add_argument("--listing-url", default=LISTING_URL, help="Listing root; state slugs are appended")
+    nationwide.add_argument("--workers", type=int, default=CONCURRENCY, help="Queue workers")
+    nationwide.add_argument("--checkpoint", default=CHECKPOINT_FILE, help="Progress file written after every page")
+    nationwide.add_argument("--fresh", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    nationwide = args.nationwide or args.states
+    output_file = args.output or (NATIONWIDE_OUTPUT_FILE if nationwide else OUTPUT_FILE)
+    if args.compress and not output_file.endswith('.gz'):
+        output_file += '.gz'
+    if args.stream and etree is None:
+        parser.error("--stream needs lxml")
+    if args.stream and args.archive:
+        parser.error("--stream does not keep whole pages, so it cannot be combined with --archive")
+
+    with profiled(args.profile, "scrape_attorneys", profile_stages()):
+        run(args, nationwide, output_file)
 
 if __name__ == "__main__":
-    scrape()
+    main()
@@ -0,0 +1,25 @@
+import importlib
+import os
+import sys
+
+# Imports from scripts/ for the top-level tools.
+#
+# The generator scripts import their siblings directly (they are run as
+# scripts, not as a package), so they only import with scripts/ on sys.path.
+# This module is the one place that sets that up. The shared lookups come
+# from small modules, so a tool that only needs the state list does not load
+# a whole generator; generator() imports one when a tool needs its rows.
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from copy_format import copy_line  # noqa: E402
+from profiling import add_profile_argument, profiled  # noqa: E402
+from us_states import STATE_CODES, STATE_NAMES, STATES  # noqa: E402
+
+__all__ = ["STATES", "STATE_CODES", "STATE_NAMES", "add_profile_argument", "copy_line", "generator", "profiled"]
+
+def generator(name):
+    """A generator script from scripts/ (e.g. "generate_scanners_and_foia"), as a module."""
+    return importlib.import_module(name)
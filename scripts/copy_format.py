@@ -0,0 +1,102 @@
+import os
+
+# Output helpers for the fixture generators: buffered streaming writes and
+# PostgreSQL COPY text format.
+#
+# Each table is written as a tab-separated file that COPY ... FROM reads
+# directly, plus a driver script that stages every file in a temp table and
+# moves it into place with one INSERT ... SELECT ... ON CONFLICT per table:
+#
+#   cd <out dir> && psql "$DATABASE_URL" -f load_fixtures.sql
+#
+# Text format escapes backslash, tab, newline and carriage return, and
+# writes NULL as \N. Arrays are written as array literals ({"a","b"}), whose
+# own quoting is applied before the COPY escaping.
+
+DRIVER_FILE = "load_fixtures.sql"
+WRITE_BUFFER = 1 << 20  # Generators stream straight to disk through a 1 MB buffer
+
+def open_output(path):
+    return open(path, "w", encoding="utf-8", newline="\n", buffering=WRITE_BUFFER)
+
+def write_joined(f, chunks, separator="\n"):
+    """Streams `chunks` to `f` like f.write(separator.join(chunks)), without building the string."""
+    first = True
+    for chunk in chunks:
+        if not first:
+            f.write(separator)
+        f.write(chunk)
+        first = False
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+def array_literal(values):
+    """['Civil Rights', 'Prisoners\\' Rights'] -> '{"Civil Rights","Prisoners\\' Rights"}'."""
+    items = []
+    for value in values:
+        if value is None:
+            items.append("NULL")
+        else:
+            items.append('"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(items) + "}"
+
+def copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (list, tuple)):
+        value = array_literal(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+def copy_line(row):
+    return "\t".join(copy_value(value) for value in row) + "\n"
+
+def write_copy_file(path, rows):
+    """Writes `rows` (tuples in column order) to `path`. Returns the row count."""
+    count = 0
+    with open_output(path) as f:
+        for row in rows:
+            f.write(copy_line(row))
+            count += 1
+    return count
+
+def staged_load_sql(data_files, table, columns, select=None, where=None, conflict="ON CONFLICT DO NOTHING"):
+    """Driver SQL that copies `data_files` into a temp stage and inserts it into `table`.
+
+    `data_files` is one path or a list of them (e.g. one per shard); all are
+    copied into the same stage and moved with a single INSERT.
+
+    `select` maps extra target columns to expressions computed at load time
+    (e.g. a user id looked up in the database); `where` filters staged rows.
+    """
+    if isinstance(data_files, str):
+        data_files = [data_files]
+    stage = table.split(".")[-1] + "_stage"
+    column_list = ", ".join(columns)
+    target_columns = column_list
+    select_list = column_list
+    if select:
+        target_columns = ", ".join(list(columns) + list(select))
+        select_list = ", ".join(list(columns) + list(select.values()))
+    # The stage has only the copied columns and none of the target's constraints
+    lines = [f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA;"]
+    lines += [f"\\copy {stage} ({column_list}) FROM '{data_file}'" for data_file in data_files]
+    lines += [f"INSERT INTO {table} ({target_columns})", f"SELECT {select_list} FROM {stage}"]
+    if where:
+        lines.append(f"WHERE {where}")
+    if conflict:
+        lines.append(conflict)
+    return "\n".join(lines) + ";\n"
+
+def write_driver(out_dir, title, statements):
+    path = os.path.join(out_dir, DRIVER_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"-- {title}\n")
+        f.write(f"-- Run from this directory: psql \"$DATABASE_URL\" -f {DRIVER_FILE}\n\n")
+        f.write("BEGIN;\n\n")
+        for statement in statements:
+            f.write(statement)
+            f.write("\n")
+        f.write("COMMIT;\n")
+    return path
@@ -1,7 +1,20 @@
+import argparse
+import os
+import sys
 import uuid
 import random
 import datetime
 
+try:
+    import numpy as np
+except ImportError:  # only the batched row engine needs it
+    np = None
+
+import copy_format
+from copy_format import open_output, staged_load_sql, write_copy_file, write_driver, write_joined
+from profiling import add_profile_argument, profiled
+from sharding import derive_seed, run_shards, shard_name, split_count, write_manifest
+
 # --- DATA ---
 
 STATES = [
@@ -124,10 +137,18 @@ def random_coords():
     lon = random.uniform(-125.0, -70.0)
     return lat, lon
 
-# --- GENERATORS ---
+# --- ROWS ---
+# Each generator yields tuples in its *_COLUMNS order; the SQL and COPY
+# writers below format the same rows.
 
-def generate_attorneys(count=200):
-    sql = []
+ATTORNEY_COLUMNS = ("name", "firm", "state", "city", "practice_areas", "specialties", "phone", "email", "website",
+                    "accepts_pro_bono", "bar_number", "years_experience")
+ACTIVIST_COLUMNS = ("name", "alias", "home_state", "primary_platform", "channel_url", "focus_areas", "verified")
+VIOLATION_COLUMNS = ("title", "description", "location_state", "location_city", "incident_date", "latitude",
+                     "longitude", "status")
+POST_COLUMNS = ("content", "post_type", "visibility")
+
+def attorney_rows(count=200):
     for _ in range(count):
         fname = random.choice(FIRST_NAMES)
         lname = random.choice(LAST_NAMES)
@@ -142,21 +163,10 @@ def generate_attorneys(count=200):
         exp = random.randint(5, 40)
         practice = random.sample(PRACTICE_AREAS, k=random.randint(1, 3))
         specs = random.sample(SPECIALTIES, k=random.randint(1, 3))
-        
-        # Array formatting for SQL
-        # Use replace("'", "''") directly here since we are wrapping in single quotes
-        practice_sql = "ARRAY[" + ", ".join([f"'{p.replace("'", "''")}'" for p in practice]) + "]"
-        specs_sql = "ARRAY[" + ", ".join([f"'{s.replace("'", "''")}'" for s in specs]) + "]"
+        pro_bono = random.choice([True, False])
+        yield (name, firm, state, city, practice, specs, phone, email, website, pro_bono, bar_num, exp)
 
-        sql.append(f"""
-        INSERT INTO public.attorneys (name, firm, state, city, practice_areas, specialties, phone, email, website, accepts_pro_bono, bar_number, years_experience)
-        VALUES ({escape_sql(name)}, {escape_sql(firm)}, {escape_sql(state)}, {escape_sql(city)}, {practice_sql}, {specs_sql}, {escape_sql(phone)}, {escape_sql(email)}, {escape_sql(website)}, {str(random.choice([True, False])).lower()}, {escape_sql(bar_num)}, {exp})
-        ON CONFLICT (name, phone) DO NOTHING;
-        """)
-    return "\n".join(sql)
-
-def generate_activists(count=200):
-    sql = []
+def activist_rows(count=200):
     for _ in range(count):
         fname = random.choice(FIRST_NAMES)
         lname = random.choice(LAST_NAMES)
@@ -166,19 +176,178 @@ def generate_activists(count=200):
         platform = random.choice(ACTIVIST_PLATFORMS)
         url = f"https://{platform.lower()}.com/{fname.lower()}{lname.lower()}"
         focus = random.sample(ACTIVIST_FOCUS, k=random.randint(1, 3))
-        
+        yield (name, alias, state, platform, url, focus, random.choice([True, False]))
+
+def violation_rows(count=100):
+    for _ in range(count):
+        title = random.choice(VIOLATION_TITLES)
+        desc = random.choice(VIOLATION_DESCRIPTIONS)
+        state = random.choice(STATES)
+        city = random.choice(CITIES.get(state, ["Unknown"]))
+        lat, lon = random_coords()
+        date = random_date()
+        yield (title, desc, state, city, date, lat, lon, 'verified')
+
+def post_rows(count=50):
+    for _ in range(count):
+        yield (random.choice(SOCIAL_POST_CONTENTS), 'text', 'public')
+
+# --- BATCHED ROWS ---
+# Same rows as above, but every random column of a batch is drawn at once
+# with NumPy; Python only assembles the final strings. The values come from
+# a NumPy generator seeded off `random`, so --seed and the shard seeds fix
+# this path too, though its rows differ from the per-row path's.
+
+BATCH_ROWS = 1 << 16
+
+# Flat city list; a state's cities are CITY_LIST[offset:offset + count]
+CITY_LIST = []
+CITY_OFFSETS = []
+CITY_COUNTS = []
+for _state in STATES:
+    _cities = CITIES.get(_state, ["Unknown"])
+    CITY_OFFSETS.append(len(CITY_LIST))
+    CITY_COUNTS.append(len(_cities))
+    CITY_LIST.extend(_cities)
+
+# Name-derived strings, indexed by last * len(FIRST_NAMES) + first
+FULL_NAMES = [f"{fname} {lname}" for lname in LAST_NAMES for fname in FIRST_NAMES]
+HANDLES = [f"{fname.lower()}{lname.lower()}" for lname in LAST_NAMES for fname in FIRST_NAMES]
+ATTORNEY_WEBSITES = [f"https://www.{(lname + fname).lower()}law.com" for lname in LAST_NAMES for fname in FIRST_NAMES]
+ATTORNEY_EMAILS = [f"info@{lname.lower()}law.com" for lname in LAST_NAMES]
+
+def _batch_rng():
+    if np is None:
+        raise RuntimeError("the numpy row engine needs numpy installed")
+    return np.random.default_rng(random.getrandbits(64))
+
+def _batch_sizes(count):
+    for start in range(0, count, BATCH_ROWS):
+        yield min(BATCH_ROWS, count - start)
+
+def _draw_names(rng, n):
+    """(name index, first-name index) columns for FULL_NAMES and friends."""
+    first = rng.integers(0, len(FIRST_NAMES), n)
+    last = rng.integers(0, len(LAST_NAMES), n)
+    return last * len(FIRST_NAMES) + first, first
+
+def _draw_cities(rng, states):
+    offsets = np.array(CITY_OFFSETS)[states]
+    counts = np.array(CITY_COUNTS)[states]
+    return offsets + (rng.random(len(states)) * counts).astype(np.int64)
+
+def _draw_samples(rng, n, choices, max_k=3):
+    """Like random.sample(choices, k=random.randint(1, max_k)) for n rows at once."""
+    order = np.argsort(rng.random((n, len(choices))), axis=1)[:, :max_k].tolist()
+    sizes = rng.integers(1, max_k + 1, n).tolist()
+    return [[choices[i] for i in row[:k]] for row, k in zip(order, sizes)]
+
+def _date_strings(start_year=2020, end_year=2025):
+    """ISO strings for every day random_date() can return, indexed by day offset."""
+    start_date = datetime.date(start_year, 1, 1)
+    days = (datetime.date(end_year, 12, 31) - start_date).days
+    return [(start_date + datetime.timedelta(days=d)).isoformat() for d in range(days)]
+
+def attorney_rows_batched(count=200):
+    rng = _batch_rng()
+    bar_prefixes = [state[:2].upper() for state in STATES]
+    for n in _batch_sizes(count):
+        names, _ = _draw_names(rng, n)
+        lasts = (names // len(FIRST_NAMES)).tolist()
+        states = rng.integers(0, len(STATES), n)
+        cities = _draw_cities(rng, states).tolist()
+        area = rng.integers(200, 1000, n).tolist()
+        exchange = rng.integers(200, 1000, n).tolist()
+        line = rng.integers(1000, 10000, n).tolist()
+        bar = rng.integers(10000, 100000, n).tolist()
+        exp = rng.integers(5, 41, n).tolist()
+        practice = _draw_samples(rng, n, PRACTICE_AREAS)
+        specs = _draw_samples(rng, n, SPECIALTIES)
+        pro_bono = (rng.random(n) < 0.5).tolist()
+        for i, (name_idx, state_idx) in enumerate(zip(names.tolist(), states.tolist())):
+            name = FULL_NAMES[name_idx]
+            yield (name, f"Law Offices of {name}", STATES[state_idx], CITY_LIST[cities[i]], practice[i], specs[i],
+                   f"{area[i]}-{exchange[i]}-{line[i]}", ATTORNEY_EMAILS[lasts[i]], ATTORNEY_WEBSITES[name_idx],
+                   pro_bono[i], f"{bar_prefixes[state_idx]}-{bar[i]}", exp[i])
+
+def activist_rows_batched(count=200):
+    rng = _batch_rng()
+    aliases = [f"{fname}Audits" for fname in FIRST_NAMES]
+    hosts = [platform.lower() for platform in ACTIVIST_PLATFORMS]
+    for n in _batch_sizes(count):
+        names, firsts = _draw_names(rng, n)
+        has_alias = (rng.random(n) > 0.5).tolist()
+        states = rng.integers(0, len(STATES), n).tolist()
+        platforms = rng.integers(0, len(ACTIVIST_PLATFORMS), n).tolist()
+        focus = _draw_samples(rng, n, ACTIVIST_FOCUS)
+        verified = (rng.random(n) < 0.5).tolist()
+        for i, (name_idx, first_idx) in enumerate(zip(names.tolist(), firsts.tolist())):
+            platform = platforms[i]
+            yield (FULL_NAMES[name_idx], aliases[first_idx] if has_alias[i] else None, STATES[states[i]],
+                   ACTIVIST_PLATFORMS[platform], f"https://{hosts[platform]}.com/{HANDLES[name_idx]}", focus[i],
+                   verified[i])
+
+def violation_rows_batched(count=100):
+    rng = _batch_rng()
+    dates = _date_strings()
+    for n in _batch_sizes(count):
+        titles = rng.integers(0, len(VIOLATION_TITLES), n).tolist()
+        descs = rng.integers(0, len(VIOLATION_DESCRIPTIONS), n).tolist()
+        states = rng.integers(0, len(STATES), n)
+        cities = _draw_cities(rng, states).tolist()
+        # Roughly continental US, as in random_coords()
+        lats = rng.uniform(25.0, 48.0, n).tolist()
+        lons = rng.uniform(-125.0, -70.0, n).tolist()
+        days = rng.integers(0, len(dates), n).tolist()
+        for i, state_idx in enumerate(states.tolist()):
+            yield (VIOLATION_TITLES[titles[i]], VIOLATION_DESCRIPTIONS[descs[i]], STATES[state_idx],
+                   CITY_LIST[cities[i]], dates[days[i]], lats[i], lons[i], 'verified')
+
+def post_rows_batched(count=50):
+    rng = _batch_rng()
+    for n in _batch_sizes(count):
+        for content in rng.integers(0, len(SOCIAL_POST_CONTENTS), n).tolist():
+            yield (SOCIAL_POST_CONTENTS[content], 'text', 'public')
+
+# Row generators by engine: "python" draws value by value from `random` (the
+# default, reproducing earlier seeded output); "numpy" draws whole columns.
+ROW_ENGINES = {
+    "python": {"attorneys": attorney_rows, "activists": activist_rows, "violations": violation_rows,
+               "posts": post_rows},
+    "numpy": {"attorneys": attorney_rows_batched, "activists": activist_rows_batched,
+              "violations": violation_rows_batched, "posts": post_rows_batched},
+}
+
+# --- GENERATORS ---
+# Each yields SQL statements one at a time; main() streams them to disk so
+# memory stays flat however many rows are requested.
+
+def generate_attorneys(count=200, engine="python"):
+    rows = ROW_ENGINES[engine]["attorneys"](count)
+    for name, firm, state, city, practice, specs, phone, email, website, pro_bono, bar_num, exp in rows:
+        # Array formatting for SQL
+        # Use replace("'", "''") directly here since we are wrapping in single quotes
+        practice_sql = "ARRAY[" + ", ".join([f"'{p.replace("'", "''")}'" for p in practice]) + "]"
+        specs_sql = "ARRAY[" + ", ".join([f"'{s.replace("'", "''")}'" for s in specs]) + "]"
+
+        yield f"""
+        INSERT INTO public.attorneys (name, firm, state, city, practice_areas, specialties, phone, email, website, accepts_pro_bono, bar_number, years_experience)
+        VALUES ({escape_sql(name)}, {escape_sql(firm)}, {escape_sql(state)}, {escape_sql(city)}, {practice_sql}, {specs_sql}, {escape_sql(phone)}, {escape_sql(email)}, {escape_sql(website)}, {str(pro_bono).lower()}, {escape_sql(bar_num)}, {exp})
+        ON CONFLICT (name, phone) DO NOTHING;
+        """
+
+def generate_activists(count=200, engine="python"):
+    for name, alias, state, platform, url, focus, verified in ROW_ENGINES[engine]["activists"](count):
         # Correctly escape array elements
         focus_sql = "ARRAY[" + ", ".join([f"'{f.replace("'", "''")}'" for f in focus]) + "]"
         
-        sql.append(f"""
+        yield f"""
         INSERT INTO public.activists (name, alias, home_state, primary_platform, channel_url, focus_areas, verified)
-        VALUES ({escape_sql(name)}, {escape_sql(alias)}, {escape_sql(state)}, {escape_sql(platform)}, {escape_sql(url)}, {focus_sql}, {str(random.choice([True, False])).lower()})
+        VALUES ({escape_sql(name)}, {escape_sql(alias)}, {escape_sql(state)}, {escape_sql(platform)}, {escape_sql(url)}, {focus_sql}, {str(verified).lower()})
         ON CONFLICT DO NOTHING;
-        """)
-    return "\n".join(sql)
+        """
 
-def generate_users_and_activity(user_count=50, violation_count=100):
-    sql = []
+def generate_users_and_activity(user_count=50, violation_count=100, post_count=50, engine="python"):
     user_ids = []
     
     # 1. Generate Users (Profiles)
@@ -229,7 +398,7 @@ def generate_users_and_activity(user_count=50, violation_count=100):
     # for now to avoid FK violations, UNLESS I can find a way to get a valid user ID.
     # I can query `auth.users` in the DO block? Yes!
     
-    sql.append("""
+    yield """
     DO $$
     DECLARE
         v_user_id UUID;
@@ -246,62 +415,175 @@ def generate_users_and_activity(user_count=50, violation_count=100):
         -- Seed Violations
         IF v_user_id IS NOT NULL OR TRUE THEN -- We can always seed violations with NULL user_id
             -- Generated Violations
-    """)
+    """
     
-    for _ in range(violation_count):
-        title = random.choice(VIOLATION_TITLES)
-        desc = random.choice(VIOLATION_DESCRIPTIONS)
-        state = random.choice(STATES)
-        city = random.choice(CITIES.get(state, ["Unknown"]))
-        lat, lon = random_coords()
-        date = random_date()
-        
-        sql.append(f"""
+    for title, desc, state, city, date, lat, lon, status in ROW_ENGINES[engine]["violations"](violation_count):
+        yield f"""
             INSERT INTO public.violations (title, description, location_state, location_city, incident_date, latitude, longitude, status, user_id)
-            VALUES ({escape_sql(title)}, {escape_sql(desc)}, {escape_sql(state)}, {escape_sql(city)}, {escape_sql(date)}, {lat}, {lon}, 'verified', v_user_id);
-        """)
+            VALUES ({escape_sql(title)}, {escape_sql(desc)}, {escape_sql(state)}, {escape_sql(city)}, {escape_sql(date)}, {lat}, {lon}, {escape_sql(status)}, v_user_id);
+        """
 
-    sql.append("""
+    yield """
         END IF;
 
         -- Seed Social Posts (Only if we have a user)
         IF v_user_id IS NOT NULL THEN
-    """)
+    """
     
-    for _ in range(50): # 50 social posts
-        content = random.choice(SOCIAL_POST_CONTENTS)
-        sql.append(f"""
+    for content, post_type, visibility in ROW_ENGINES[engine]["posts"](post_count):
+        yield f"""
             INSERT INTO public.posts (user_id, content, post_type, visibility)
-            VALUES (v_user_id, {escape_sql(content)}, 'text', 'public');
-        """)
+            VALUES (v_user_id, {escape_sql(content)}, {escape_sql(post_type)}, {escape_sql(visibility)});
+        """
         
-    sql.append("""
+    yield """
         END IF;
     END $$;
-    """)
-    
-    return "\n".join(sql)
+    """
 
-# --- MAIN ---
+# --- OUTPUT ---
 
-def main():
-    output_file = "supabase/migrations/20260118000000_mega_seed_expansion.sql"
-    with open(output_file, "w", encoding="utf-8") as f:
+SEED_USER = "(SELECT id FROM auth.users LIMIT 1)"
+
+# (file stem, table, columns, driver options) in load order; the stem also keys ROW_ENGINES
+COPY_TABLES = [
+    # No conflict target: public.attorneys is unique on (name, state) as well as (name, phone), and a
+    # generated name can repeat in a state, so a row clashing on either key is skipped
+    ("attorneys", "public.attorneys", ATTORNEY_COLUMNS, {}),
+    ("activists", "public.activists", ACTIVIST_COLUMNS, {}),
+    # Attributed to any existing user, or NULL, like the DO block in the migration
+    ("violations", "public.violations", VIOLATION_COLUMNS, {"select": {"user_id": SEED_USER}, "conflict": ""}),
+    # posts.user_id is required, so posts only load once a user exists
+    ("posts", "public.posts", POST_COLUMNS,
+     {"select": {"user_id": SEED_USER}, "where": "EXISTS (SELECT 1 FROM auth.users)", "conflict": ""}),
+]
+COUNT_NAMES = tuple(stem for stem, *_ in COPY_TABLES)
+
+def write_sql(output_file, attorneys=300, activists=200, violations=100, posts=50, engine="python"):
+    with open_output(output_file) as f:
         f.write("-- MEGA SEED MIGRATION - GENERATED BY SCRIPT\n")
         f.write("-- Contains attorneys, activists, and sample violations\n\n")
         
         f.write("-- 1. ATTORNEYS\n")
-        f.write(generate_attorneys(300))
+        write_joined(f, generate_attorneys(attorneys, engine))
         f.write("\n\n")
         
         f.write("-- 2. ACTIVISTS\n")
-        f.write(generate_activists(200))
+        write_joined(f, generate_activists(activists, engine))
         f.write("\n\n")
         
         f.write("-- 3. VIOLATIONS AND SOCIAL\n")
-        f.write(generate_users_and_activity(50, 100))
-        
-    print(f"Successfully wrote migration to {output_file}")
+        write_joined(f, generate_users_and_activity(50, violations, posts, engine))
+
+def write_copy_files(out_dir, counts, suffix="", engine="python"):
+    """Writes one COPY file per table. Returns the file names in COPY_TABLES order."""
+    names = []
+    for (stem, _, _, _), count in zip(COPY_TABLES, counts):
+        name = f"{stem}{suffix}.tsv"
+        write_copy_file(os.path.join(out_dir, name), ROW_ENGINES[engine][stem](count))
+        names.append(name)
+    return names
+
+def write_copy_driver(out_dir, files_per_table, counts):
+    statements = []
+    for (_, table, columns, options), files, count in zip(COPY_TABLES, files_per_table, counts):
+        statements.append(f"-- {table}: {count} rows\n" + staged_load_sql(files, table, columns, **options))
+    return write_driver(out_dir, "MEGA SEED FIXTURES - GENERATED BY SCRIPT", statements)
+
+def write_copy_fixtures(out_dir, attorneys=300, activists=200, violations=100, posts=50, engine="python"):
+    """Writes COPY text files and a driver SQL instead of the INSERT migration."""
+    os.makedirs(out_dir, exist_ok=True)
+    counts = (attorneys, activists, violations, posts)
+    files = write_copy_files(out_dir, counts, engine=engine)
+    return write_copy_driver(out_dir, [[name] for name in files], counts)
+
+# --- SHARDED OUTPUT ---
+
+def generate_shard(task):
+    """Process-pool worker: writes one shard with its own derived seed."""
+    random.seed(task["seed"])
+    name = shard_name(task["shard"], task["shards"])
+    counts = task["counts"]
+    if task["format"] == "copy":
+        files = write_copy_files(task["out_dir"], counts, suffix=f".{name}", engine=task["engine"])
+    else:
+        files = [f"{name}.sql"]
+        write_sql(os.path.join(task["out_dir"], files[0]), *counts, engine=task["engine"])
+    return {"shard": task["shard"], "seed": task["seed"], "rows": dict(zip(COUNT_NAMES, counts)), "files": files}
+
+def write_sharded(out_dir, fmt, counts, shards, master_seed, jobs=None, engine="python"):
+    """Splits every table's row count across `shards` shards generated in parallel.
+
+    Output is byte-identical for a given master seed and shard count. COPY
+    shards share one driver that loads every shard's file per table.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    per_table = [split_count(count, shards) for count in counts]
+    tasks = [{"shard": i, "shards": shards, "seed": derive_seed(master_seed, i), "format": fmt, "engine": engine,
+              "out_dir": out_dir, "counts": tuple(split[i] for split in per_table)} for i in range(shards)]
+    results = run_shards(generate_shard, tasks, jobs)
+
+    if fmt == "copy":
+        files_per_table = [[result["files"][t] for result in results] for t in range(len(COPY_TABLES))]
+        write_copy_driver(out_dir, files_per_table, counts)
+    return write_manifest(out_dir, "generate_mega_seed", master_seed, results)
+
+# --- MAIN ---
+
+def profile_stages():
+    """Functions timed by --profile: row drawing, SQL/COPY formatting, and file writes."""
+    module = sys.modules[__name__]
+    stages = [(rows, table, "generate") for rows in ROW_ENGINES.values() for table in rows]
+    stages += [(module, name, "serialize")
+               for name in ("generate_attorneys", "generate_activists", "generate_users_and_activity")]
+    stages += [(copy_format, "copy_line", "serialize"), (module, "write_joined", "write"),
+               (module, "write_copy_file", "write")]
+    return stages
+
+def run(args, counts):
+    if args.shards:
+        master_seed = args.seed if args.seed is not None else 0
+        manifest = write_sharded(args.out_dir, args.format, counts, args.shards, master_seed, args.jobs,
+                                 args.engine)
+        print(f"Successfully wrote {args.shards} shards (master seed {master_seed}); manifest at {manifest}")
+        return
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if args.format == "copy":
+        driver = write_copy_fixtures(args.out_dir, *counts, engine=args.engine)
+        print(f"Successfully wrote COPY fixtures; load with {driver}")
+        return
+
+    write_sql(args.output, *counts, engine=args.engine)
+    print(f"Successfully wrote migration to {args.output}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate attorney, activist and violation seed data.")
+    parser.add_argument("--format", choices=["sql", "copy"], default="sql",
+                        help="sql: INSERT migration; copy: COPY text files plus a psql driver")
+    parser.add_argument("--output", default="supabase/migrations/20260118000000_mega_seed_expansion.sql",
+                        help="Migration file for --format sql")
+    parser.add_argument("--out-dir", default="copy_fixtures/mega_seed",
+                        help="Output directory for --format copy or --shards")
+    parser.add_argument("--attorneys", type=int, default=300)
+    parser.add_argument("--activists", type=int, default=200)
+    parser.add_argument("--violations", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--seed", type=int, help="Master seed for reproducible output (0 when sharding)")
+    parser.add_argument("--shards", type=int, help="Split rows across this many shard files, one process each")
+    parser.add_argument("--jobs", type=int, help="Worker processes for --shards (default: CPU count)")
+    parser.add_argument("--engine", choices=sorted(ROW_ENGINES), default="python",
+                        help="python: per-row draws (reproduces earlier seeded output); numpy: batched columns")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.engine == "numpy" and np is None:
+        parser.error("--engine numpy needs numpy installed")
+    counts = (args.attorneys, args.activists, args.violations, args.posts)
+
+    with profiled(args.profile, "generate_mega_seed", profile_stages()):
+        run(args, counts)
 
 if __name__ == "__main__":
     main()
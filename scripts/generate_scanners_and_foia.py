@@ -1,21 +1,16 @@
+import argparse
+import os
+import sys
 import uuid
 import random
 import datetime
 
-# --- DATA ---
+import copy_format
+from copy_format import open_output, staged_load_sql, write_copy_file, write_driver, write_joined
+from profiling import add_profile_argument, profiled
+from us_states import STATES
 
-STATES = [
-    ("Alabama", "AL"), ("Alaska", "AK"), ("Arizona", "AZ"), ("Arkansas", "AR"), ("California", "CA"),
-    ("Colorado", "CO"), ("Connecticut", "CT"), ("Delaware", "DE"), ("Florida", "FL"), ("Georgia", "GA"),
-    ("Hawaii", "HI"), ("Idaho", "ID"), ("Illinois", "IL"), ("Indiana", "IN"), ("Iowa", "IA"),
-    ("Kansas", "KS"), ("Kentucky", "KY"), ("Louisiana", "LA"), ("Maine", "ME"), ("Maryland", "MD"),
-    ("Massachusetts", "MA"), ("Michigan", "MI"), ("Minnesota", "MN"), ("Mississippi", "MS"), ("Missouri", "MO"),
-    ("Montana", "MT"), ("Nebraska", "NE"), ("Nevada", "NV"), ("New Hampshire", "NH"), ("New Jersey", "NJ"),
-    ("New Mexico", "NM"), ("New York", "NY"), ("North Carolina", "NC"), ("North Dakota", "ND"), ("Ohio", "OH"),
-    ("Oklahoma", "OK"), ("Oregon", "OR"), ("Pennsylvania", "PA"), ("Rhode Island", "RI"), ("South Carolina", "SC"),
-    ("South Dakota", "SD"), ("Tennessee", "TN"), ("Texas", "TX"), ("Utah", "UT"), ("Vermont", "VT"),
-    ("Virginia", "VA"), ("Washington", "WA"), ("West Virginia", "WV"), ("Wisconsin", "WI"), ("Wyoming", "WY")
-]
+# --- DATA ---
 
 # Major cities/counties per state for realistic generation
 LOCATIONS = {
@@ -78,14 +73,21 @@ def escape_sql(text):
         return "NULL"
     return "'" + text.replace("'", "''") + "'"
 
-# --- GENERATORS ---
+# --- ROWS ---
+# Each generator yields tuples in its *_COLUMNS order; the SQL and COPY
+# writers below format the same rows.
 
-def generate_scanner_links():
-    sql = []
-    
+SCANNER_COLUMNS = ("state", "state_code", "city", "county", "scanner_name", "description", "broadcastify_url",
+                   "link_type", "listener_count", "is_active")
+FOIA_COLUMNS = ("name", "agency_type", "state", "city", "county", "foia_email", "website_url", "accepts_email",
+                "is_active", "notes")
+
+def scanner_rows(feeds_per_location=1, seed=None):
+    # With a seed, each state draws from its own stream, so its rows don't shift when another state's change
     for state_name, state_code in STATES:
+        rng = random if seed is None else random.Random(f"{seed}:{state_code}")
         locations = LOCATIONS.get(state_code, ["Main"])
-        for loc in locations:
+        for loc in locations * feeds_per_location:
             # Generate a realistic-looking entry
             if "County" in loc:
                 name = f"{loc} Sheriff and Fire"
@@ -100,21 +102,13 @@ def generate_scanner_links():
 
             # Mock Broadcastify URL (these pattern matches help realism but aren't guaranteed live without real scraping)
             # We use a placeholder structure: broadcastify.com/listen/ctid/[random]
-            url = f"https://www.broadcastify.com/listen/feed/{random.randint(1000, 35000)}"
+            url = f"https://www.broadcastify.com/listen/feed/{rng.randint(1000, 35000)}"
             
-            listeners = random.randint(5, 5000)
-            
-            sql.append(f"""
-            INSERT INTO public.scanner_links (state, state_code, city, county, scanner_name, description, broadcastify_url, link_type, listener_count, is_active)
-            VALUES ({escape_sql(state_name)}, {escape_sql(state_code)}, {escape_sql(city)}, {escape_sql(county)}, {escape_sql(name)}, {escape_sql(desc)}, {escape_sql(url)}, 'broadcastify', {listeners}, true)
-            ON CONFLICT DO NOTHING;
-            """)
-            
-    return "\n".join(sql)
+            listeners = rng.randint(5, 5000)
 
-def generate_foia_agencies():
-    sql = []
-    
+            yield (state_name, state_code, city, county, name, desc, url, 'broadcastify', listeners, True)
+
+def foia_rows():
     for state_name, state_code in STATES:
         # 1. State Police / Highway Patrol
         agency_name = f"{state_name} State Police"
@@ -125,12 +119,9 @@ def generate_foia_agencies():
              
         email = f"publicrecords@{state_code.lower()}.gov"
         website = f"https://www.{state_code.lower()}.gov/publicsafety"
-        
-        sql.append(f"""
-        INSERT INTO public.foia_agencies (name, agency_type, state, foia_email, website_url, accepts_email, is_active, notes)
-        VALUES ({escape_sql(agency_name)}, 'State', {escape_sql(state_name)}, {escape_sql(email)}, {escape_sql(website)}, true, true, 'Primary state law enforcement agency')
-        ON CONFLICT DO NOTHING;
-        """)
+
+        yield (agency_name, 'State', state_name, None, None, email, website, True, True,
+               'Primary state law enforcement agency')
         
         # 2. Major City PDs
         locations = LOCATIONS.get(state_code, [])
@@ -139,40 +130,108 @@ def generate_foia_agencies():
                 pd_name = f"{loc} Police Department"
                 pd_email = f"records@{loc.lower().replace(' ', '')}pd.gov"
                 pd_site = f"https://www.{loc.lower().replace(' ', '')}.gov/police"
-                
-                sql.append(f"""
-                INSERT INTO public.foia_agencies (name, agency_type, state, city, foia_email, website_url, accepts_email, is_active)
-                VALUES ({escape_sql(pd_name)}, 'Municipal', {escape_sql(state_name)}, {escape_sql(loc)}, {escape_sql(pd_email)}, {escape_sql(pd_site)}, true, true)
-                ON CONFLICT DO NOTHING;
-                """)
+                yield (pd_name, 'Municipal', state_name, loc, None, pd_email, pd_site, True, True, None)
             else:
                 so_name = f"{loc} Sheriff's Office"
                 so_email = f"foia@{loc.lower().replace(' ', '')}so.gov"
-                
-                sql.append(f"""
+                yield (so_name, 'County', state_name, None, loc.replace(' County', ''), so_email, None, True, True, None)
+
+# --- GENERATORS ---
+# Each yields SQL statements one at a time; main() streams them to disk.
+
+def generate_scanner_links(feeds_per_location=1):
+    for state_name, state_code, city, county, name, desc, url, link_type, listeners, is_active in scanner_rows(feeds_per_location):
+        yield f"""
+            INSERT INTO public.scanner_links (state, state_code, city, county, scanner_name, description, broadcastify_url, link_type, listener_count, is_active)
+            VALUES ({escape_sql(state_name)}, {escape_sql(state_code)}, {escape_sql(city)}, {escape_sql(county)}, {escape_sql(name)}, {escape_sql(desc)}, {escape_sql(url)}, {escape_sql(link_type)}, {listeners}, {str(is_active).lower()})
+            ON CONFLICT DO NOTHING;
+            """
+
+def generate_foia_agencies():
+    for name, agency_type, state_name, city, county, email, website, accepts_email, is_active, notes in foia_rows():
+        if agency_type == 'State':
+            yield f"""
+        INSERT INTO public.foia_agencies (name, agency_type, state, foia_email, website_url, accepts_email, is_active, notes)
+        VALUES ({escape_sql(name)}, 'State', {escape_sql(state_name)}, {escape_sql(email)}, {escape_sql(website)}, {str(accepts_email).lower()}, {str(is_active).lower()}, {escape_sql(notes)})
+        ON CONFLICT DO NOTHING;
+        """
+        elif agency_type == 'Municipal':
+            yield f"""
+                INSERT INTO public.foia_agencies (name, agency_type, state, city, foia_email, website_url, accepts_email, is_active)
+                VALUES ({escape_sql(name)}, 'Municipal', {escape_sql(state_name)}, {escape_sql(city)}, {escape_sql(email)}, {escape_sql(website)}, {str(accepts_email).lower()}, {str(is_active).lower()})
+                ON CONFLICT DO NOTHING;
+                """
+        else:
+            yield f"""
                 INSERT INTO public.foia_agencies (name, agency_type, state, county, foia_email, accepts_email, is_active)
-                VALUES ({escape_sql(so_name)}, 'County', {escape_sql(state_name)}, {escape_sql(loc.replace(' County', ''))}, {escape_sql(so_email)}, true, true)
+                VALUES ({escape_sql(name)}, 'County', {escape_sql(state_name)}, {escape_sql(county)}, {escape_sql(email)}, {str(accepts_email).lower()}, {str(is_active).lower()})
                 ON CONFLICT DO NOTHING;
-                """)
+                """
 
-    return "\n".join(sql)
+# --- COPY OUTPUT ---
+
+def write_copy_fixtures(out_dir, feeds_per_location=1):
+    """Writes COPY text files and a driver SQL instead of the INSERT migration."""
+    os.makedirs(out_dir, exist_ok=True)
+    tables = [
+        ("scanner_links.tsv", "public.scanner_links", SCANNER_COLUMNS, scanner_rows(feeds_per_location)),
+        ("foia_agencies.tsv", "public.foia_agencies", FOIA_COLUMNS, foia_rows()),
+    ]
+
+    statements = []
+    for data_file, table, columns, rows in tables:
+        count = write_copy_file(os.path.join(out_dir, data_file), rows)
+        statements.append(f"-- {table}: {count} rows\n" + staged_load_sql(data_file, table, columns))
+    return write_driver(out_dir, "SCANNER AND FOIA FIXTURES - GENERATED BY SCRIPT", statements)
 
 # --- MAIN ---
 
-def main():
-    output_file = "supabase/migrations/20260118010000_scanners_and_foia_seed.sql"
-    with open(output_file, "w", encoding="utf-8") as f:
+def profile_stages():
+    """Functions timed by --profile: row building, SQL/COPY formatting, and file writes."""
+    module = sys.modules[__name__]
+    return [(module, "scanner_rows", "generate"), (module, "foia_rows", "generate"),
+            (module, "generate_scanner_links", "serialize"), (module, "generate_foia_agencies", "serialize"),
+            (copy_format, "copy_line", "serialize"), (module, "write_joined", "write"),
+            (module, "write_copy_file", "write")]
+
+def run(args):
+    if args.format == "copy":
+        driver = write_copy_fixtures(args.out_dir, args.feeds_per_location)
+        print(f"Successfully wrote COPY fixtures; load with {driver}")
+        return
+
+    output_file = args.output
+    with open_output(output_file) as f:
         f.write("-- REALISTIC SCANNER AND FOIA SEED MIGRATION\n")
         f.write("-- Generated by script\n\n")
         
         f.write("-- 1. POLICE SCANNERS\n")
-        f.write(generate_scanner_links())
+        write_joined(f, generate_scanner_links(args.feeds_per_location))
         f.write("\n\n")
         
         f.write("-- 2. FOIA AGENCIES\n")
-        f.write(generate_foia_agencies())
+        write_joined(f, generate_foia_agencies())
 
     print(f"Successfully wrote migration to {output_file}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate scanner link and FOIA agency seed data.")
+    parser.add_argument("--format", choices=["sql", "copy"], default="sql",
+                        help="sql: INSERT migration; copy: COPY text files plus a psql driver")
+    parser.add_argument("--output", default="supabase/migrations/20260118010000_scanners_and_foia_seed.sql",
+                        help="Migration file for --format sql")
+    parser.add_argument("--out-dir", default="copy_fixtures/scanners_and_foia", help="Output directory for --format copy")
+    parser.add_argument("--feeds-per-location", type=int, default=1,
+                        help="Scanner feeds generated for each location (raise for load-test volumes)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible feed ids and listener counts")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    with profiled(args.profile, "generate_scanners_and_foia", profile_stages()):
+        run(args)
+
 if __name__ == "__main__":
     main()
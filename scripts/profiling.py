@@ -0,0 +1,266 @@
+import cProfile
+import contextlib
+import contextvars
+import functools
+import inspect
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+# Shared --profile mode for the scraper and the fixture generators.
+#
+# A profiled run writes four files to the profile directory, all prefixed
+# <entry point>-<timestamp>-<pid>:
+#
+#   .prof          cProfile stats (snakeviz, pstats, gprof2dot)
+#   .collapsed     sampled stacks of the main thread in collapsed format,
+#                  one "frame;frame;frame count" line per distinct stack
+#                  (flamegraph.pl, speedscope, inferno)
+#   .txt           top cProfile functions and tracemalloc allocation sites
+#   .json          wall time per stage, peak traced memory and run details,
+#                  for comparing runs side by side
+#
+# Stages are timed by wrapping the functions an entry point names (see
+# profile_stages() in each script) for the length of the run, so the code
+# being profiled needs no changes. Stage times are exclusive: time spent in
+# a nested stage (e.g. row generation inside SQL formatting) is only counted
+# there. Generator functions are timed on every next(), so lazy pipelines
+# split correctly. Coroutines are timed from call to return, less the time
+# spent in the sync stages they run (e.g. parsing a streamed response inside
+# a fetch). That still overlaps between concurrent requests, so an async
+# stage can exceed the wall time.
+# Only the main thread is sampled and timed; process-pool workers are not.
+#
+#   python scrape_attorneys.py --profile
+#   python scripts/generate_mega_seed.py --attorneys 100000 --profile profiles/seed
+
+PROFILE_DIR = "profiles"
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+TOP = 25  # Rows in the cProfile and tracemalloc tables
+
+# Seconds spent in sync stages by the coroutine stage running in this task
+_coroutine_nested = contextvars.ContextVar("coroutine_nested", default=None)
+
+def add_profile_argument(parser):
+    parser.add_argument("--profile", nargs="?", const=PROFILE_DIR, metavar="DIR",
+                        help=f"Write cProfile stats, sampled stacks, top allocations and per-stage wall time "
+                             f"(default directory {PROFILE_DIR})")
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler(threading.Thread):
+    """Counts the main thread's stacks every `interval` seconds."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._target = threading.main_thread().ident
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                key = ";".join(reversed(labels))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+                self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+class Profiler:
+    """cProfile, stack sampling, tracemalloc and stage timers for one run."""
+
+    def __init__(self, out_dir, name, stages=(), interval=SAMPLE_INTERVAL, top=TOP):
+        self.out_dir = out_dir
+        self.name = name
+        self.stages = stages  # (owner, attribute, stage name); owner is a module, class or dict
+        self.top = top
+        self.timings = {}  # stage -> [exclusive seconds, calls]
+        self._stack = []  # [stage, start, time in nested stages]
+        self._patched = []
+        self._cprofile = cProfile.Profile()
+        self._sampler = StackSampler(interval)
+        self._start = None
+        self.wall = None
+
+    # Stage timers
+
+    def _enter(self, stage):
+        self._stack.append([stage, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        stage, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        timing = self.timings.setdefault(stage, [0.0, 0])
+        timing[0] += elapsed - nested
+        timing[1] += 1
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        else:
+            in_coroutine = _coroutine_nested.get()
+            if in_coroutine is not None:
+                in_coroutine[0] += elapsed
+
+    def _timed_iter(self, iterator, stage):
+        while True:
+            self._enter(stage)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            yield item
+
+    def _wrap(self, func, stage):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def timed_coroutine(*args, **kwargs):
+                outer = _coroutine_nested.get()
+                nested = [0.0]
+                token = _coroutine_nested.set(nested)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _coroutine_nested.reset(token)
+                    timing = self.timings.setdefault(stage, [0.0, 0])
+                    timing[0] += time.perf_counter() - start - nested[0]
+                    timing[1] += 1
+                    if outer is not None:
+                        outer[0] += nested[0]
+            return timed_coroutine
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            self._enter(stage)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                self._exit()
+            if inspect.isgenerator(result):
+                return self._timed_iter(result, stage)
+            return result
+        return timed
+
+    def _patch(self):
+        for owner, attr, stage in self.stages:
+            if isinstance(owner, dict):
+                original = owner[attr]
+                owner[attr] = self._wrap(original, stage)
+            else:
+                original = getattr(owner, attr)
+                setattr(owner, attr, self._wrap(original, stage))
+            self._patched.append((owner, attr, original))
+
+    def _unpatch(self):
+        for owner, attr, original in reversed(self._patched):
+            if isinstance(owner, dict):
+                owner[attr] = original
+            else:
+                setattr(owner, attr, original)
+        self._patched.clear()
+
+    # Run
+
+    def start(self):
+        self._patch()
+        tracemalloc.start()
+        self._sampler.start()
+        self._start = time.perf_counter()
+        self._cprofile.enable()
+
+    def stop(self):
+        self._cprofile.disable()
+        self.wall = time.perf_counter() - self._start
+        self._sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self._unpatch()
+        return snapshot, peak
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        snapshot, peak = self.stop()
+        self.write(snapshot, peak)
+
+    # Output
+
+    def stage_report(self):
+        stages = {stage: {"seconds": round(seconds, 6), "calls": calls}
+                  for stage, (seconds, calls) in sorted(self.timings.items())}
+        return stages
+
+    def write(self, snapshot, peak):
+        os.makedirs(self.out_dir, exist_ok=True)
+        prefix = os.path.join(self.out_dir, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+
+        self._cprofile.dump_stats(f"{prefix}.prof")
+        with open(f"{prefix}.collapsed", "w", encoding="utf-8") as f:
+            f.write(self._sampler.collapsed())
+
+        allocations = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]).statistics("lineno")[:self.top]
+        stats_text = io.StringIO()
+        pstats.Stats(self._cprofile, stream=stats_text).sort_stats("cumulative").print_stats(self.top)
+        with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+            f.write(f"# {self.name}: {self.wall:.3f}s wall, peak traced memory {peak / (1 << 20):.1f} MB\n\n")
+            f.write("# Stages (exclusive seconds, calls)\n")
+            for stage, timing in self.stage_report().items():
+                f.write(f"{stage:<12} {timing['seconds']:>12.3f} {timing['calls']:>10}\n")
+            f.write(f"\n# Top {self.top} allocation sites\n")
+            for stat in allocations:
+                f.write(f"{stat}\n")
+            f.write(f"\n# Top {self.top} functions by cumulative time\n")
+            f.write(stats_text.getvalue())
+
+        report = {
+            "entry_point": self.name,
+            "argv": sys.argv[1:],
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "wall_seconds": round(self.wall, 6),
+            "stages": self.stage_report(),
+            "peak_traced_mb": round(peak / (1 << 20), 3),
+            "samples": self._sampler.samples,
+            "sample_interval": self._sampler.interval,
+            "top_allocations": [{"site": str(stat.traceback), "mb": round(stat.size / (1 << 20), 3),
+                                 "blocks": stat.count} for stat in allocations],
+        }
+        with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+        stages = ", ".join(f"{stage} {timing['seconds']:.2f}s" for stage, timing in report["stages"].items())
+        print(f"[*] Profile: {self.wall:.2f}s wall ({stages or 'no stages'}), "
+              f"peak {report['peak_traced_mb']:.1f} MB traced, {self._sampler.samples} samples -> {prefix}.*")
+
+def profiled(out_dir, name, stages=()):
+    """A Profiler context when `out_dir` is set (the --profile value), otherwise a no-op."""
+    if not out_dir:
+        return contextlib.nullcontext()
+    return Profiler(out_dir, name, stages)
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Deterministic sharding for the fixture generators.
+#
+# A run with a master seed and shard count is split into shards that each
+# get a seed derived from (master seed, shard index) and write their own
+# files. Shards run in a process pool, but since no shard depends on another
+# or on scheduling order, the output is byte-identical from run to run.
+
+MANIFEST_FILE = "manifest.json"
+
+def derive_seed(master_seed, shard):
+    digest = hashlib.sha256(f"{master_seed}:{shard}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def split_count(total, shards):
+    """Splits `total` rows as evenly as possible: split_count(10, 3) -> [4, 3, 3]."""
+    base, extra = divmod(total, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+def shard_name(shard, shards):
+    return f"shard-{shard + 1:03d}-of-{shards:03d}"
+
+def run_shards(worker, tasks, jobs=None):
+    """Runs `worker(task)` for every task in a process pool; results keep task order."""
+    if jobs == 1 or len(tasks) == 1:
+        return [worker(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(worker, tasks))
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def write_manifest(out_dir, generator, master_seed, shards):
+    """Records each shard's seed, files, row counts and checksums.
+
+    `shards` is the list of per-shard results: {"shard", "seed", "rows", "files"}
+    with file paths relative to `out_dir`.
+    """
+    for shard in shards:
+        shard["sha256"] = {name: file_digest(os.path.join(out_dir, name)) for name in shard["files"]}
+    manifest = {"generator": generator, "master_seed": master_seed, "shard_count": len(shards), "shards": shards}
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return path
@@ -0,0 +1,230 @@
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import time
+
+import numpy as np
+
+from generate_mega_seed import ROW_ENGINES, VIOLATION_COLUMNS
+
+# Precomputed map tiles for violation coordinates.
+#
+# Points are projected to Web Mercator tiles (the z/x/y scheme map libraries
+# use; each tile also carries its Bing-style quadkey). For every zoom level
+# a tile file holds the clusters for that viewport: points are bucketed into
+# a grid of 2**CELL_DEPTH x 2**CELL_DEPTH cells per tile, and each non-empty
+# cell becomes one cluster with its count, centroid and per-state counts:
+#
+#   <out>/index.json          zoom range, bounds, totals and counts by state
+#   <out>/<z>/<x>/<y>.json    {"z", "x", "y", "quadkey", "count", "clusters": [
+#                              {"lat", "lon", "count", "states": {"Ohio": 3}}, ...]}
+#
+# A viewport needs a handful of tiles of a few KB each, however many points
+# are behind them. Aggregation is vectorized: every point is projected once
+# at the deepest cell level, and coarser levels are bit shifts of that.
+#
+# Inputs are COPY fixtures from generate_mega_seed.py --format copy (any
+# number of violations*.tsv shards) or CSV exports with a header row, e.g.
+#
+#   \copy (SELECT location_state, latitude, longitude FROM public.violations) TO 'violations.csv' CSV HEADER
+#
+#   python scripts/violation_tiles.py copy_fixtures/violations.tsv
+#   python scripts/violation_tiles.py violations.csv --max-zoom 12 --output public/tiles/violations
+#   python scripts/violation_tiles.py --generate 1000000   # synthetic points, for sizing
+
+OUTPUT_DIR = "public/tiles/violations"
+INDEX_FILE = "index.json"
+MIN_ZOOM = 0
+MAX_ZOOM = 10
+CELL_DEPTH = 3  # Clusters per tile edge = 2**CELL_DEPTH
+MAX_LATITUDE = 85.05112878  # Web Mercator's limit
+COORD_DIGITS = 5  # ~1 m
+
+LAT = VIOLATION_COLUMNS.index("latitude")
+LON = VIOLATION_COLUMNS.index("longitude")
+STATE = VIOLATION_COLUMNS.index("location_state")
+
+# --- INPUT ---
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def read_copy_file(path, lats, lons, states):
+    """Appends the points of a COPY text file in VIOLATION_COLUMNS order; \\N coordinates become NaN."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            lats.append(_float(fields[LAT]))
+            lons.append(_float(fields[LON]))
+            states.append(fields[STATE].replace("\\\\", "\\"))
+
+def read_csv_file(path, lats, lons, states):
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            lats.append(_float(row.get("latitude")))
+            lons.append(_float(row.get("longitude")))
+            states.append(row.get("location_state") or "")
+
+def load_points(paths):
+    """(lat, lon, state index) arrays and the state names, without rows lacking valid coordinates."""
+    lats, lons, states = [], [], []
+    for path in paths:
+        reader = read_csv_file if path.endswith(".csv") else read_copy_file
+        reader(path, lats, lons, states)
+    return to_arrays(lats, lons, states)
+
+def generated_points(count, engine="numpy"):
+    lats, lons, states = [], [], []
+    for row in ROW_ENGINES[engine]["violations"](count):
+        states.append(row[STATE])
+        lats.append(row[LAT])
+        lons.append(row[LON])
+    return to_arrays(lats, lons, states)
+
+def to_arrays(lats, lons, states):
+    lat = np.asarray(lats, dtype=np.float64)
+    lon = np.asarray(lons, dtype=np.float64)
+    names, state = np.unique(np.asarray(states, dtype=object).astype(str), return_inverse=True)
+    keep = np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    return lat[keep], lon[keep], state[keep], names.tolist()
+
+# --- TILING ---
+
+def project(lat, lon, zoom):
+    """Integer Web Mercator tile coordinates of each point at `zoom`."""
+    scale = float(1 << zoom)
+    x = (lon + 180.0) / 360.0 * scale
+    phi = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    y = (1.0 - np.log(np.tan(phi) + 1.0 / np.cos(phi)) / math.pi) / 2.0 * scale
+    limit = (1 << zoom) - 1
+    return np.clip(x.astype(np.int64), 0, limit), np.clip(y.astype(np.int64), 0, limit)
+
+def quadkey(z, x, y):
+    digits = []
+    for level in range(z, 0, -1):
+        mask = 1 << (level - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return "".join(digits)
+
+def aggregate_zoom(z, cell_x, cell_y, lat, lon, state, state_names, depth=CELL_DEPTH):
+    """Tiles of one zoom level: {(x, y): tile dict}. cell_x/cell_y are cell coordinates at z + depth."""
+    bits = z + depth
+    cell_key = (cell_x << bits) | cell_y
+    cells, inverse, counts = np.unique(cell_key, return_inverse=True, return_counts=True)
+    lat_mean = np.bincount(inverse, weights=lat) / counts
+    lon_mean = np.bincount(inverse, weights=lon) / counts
+
+    # Per-state counts as one more unique() over (cell, state) pairs
+    n_states = max(1, len(state_names))
+    pairs, pair_counts = np.unique(inverse * n_states + state, return_counts=True)
+    pair_cell = (pairs // n_states).tolist()
+    pair_state = (pairs % n_states).tolist()
+    by_cell = [{} for _ in range(len(cells))]
+    for cell, st, count in zip(pair_cell, pair_state, pair_counts.tolist()):
+        by_cell[cell][state_names[st]] = count
+
+    mask = (1 << bits) - 1
+    tile_x = ((cells >> bits) >> depth).tolist()
+    tile_y = ((cells & mask) >> depth).tolist()
+    tiles = {}
+    for i, (x, y) in enumerate(zip(tile_x, tile_y)):
+        tile = tiles.get((x, y))
+        if tile is None:
+            tile = tiles[(x, y)] = {"z": z, "x": x, "y": y, "quadkey": quadkey(z, x, y), "count": 0, "clusters": []}
+        count = int(counts[i])
+        tile["count"] += count
+        tile["clusters"].append({"lat": round(float(lat_mean[i]), COORD_DIGITS),
+                                 "lon": round(float(lon_mean[i]), COORD_DIGITS),
+                                 "count": count, "states": by_cell[i]})
+    return tiles
+
+def build_tiles(lat, lon, state, state_names, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, depth=CELL_DEPTH):
+    """Yields (zoom, tiles) from min_zoom to max_zoom."""
+    deepest = max_zoom + depth
+    cell_x, cell_y = project(lat, lon, deepest)
+    for z in range(min_zoom, max_zoom + 1):
+        shift = deepest - (z + depth)
+        yield z, aggregate_zoom(z, cell_x >> shift, cell_y >> shift, lat, lon, state, state_names, depth)
+
+# --- OUTPUT ---
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+def write_tiles(out_dir, lat, lon, state, state_names, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, depth=CELL_DEPTH):
+    """Writes the tile tree to `out_dir`, replacing an earlier run's. Returns the index dict."""
+    if os.path.isdir(out_dir) and os.listdir(out_dir) and not os.path.exists(os.path.join(out_dir, INDEX_FILE)):
+        raise SystemExit(f"[!] {out_dir} is not empty and has no {INDEX_FILE}; refusing to replace it")
+    tmp_dir = f"{out_dir.rstrip(os.sep)}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    zooms = {}
+    for z, tiles in build_tiles(lat, lon, state, state_names, min_zoom, max_zoom, depth):
+        size = largest = 0
+        for (x, y), tile in tiles.items():
+            tile_dir = os.path.join(tmp_dir, str(z), str(x))
+            os.makedirs(tile_dir, exist_ok=True)
+            path = os.path.join(tile_dir, f"{y}.json")
+            _write_json(path, tile)
+            tile_size = os.path.getsize(path)
+            size += tile_size
+            largest = max(largest, tile_size)
+        zooms[str(z)] = {"tiles": len(tiles), "bytes": size, "max_tile_bytes": largest}
+        print(f"[*] Zoom {z}: {len(tiles):,} tiles, {size / 1024:,.1f} KB (largest {largest / 1024:,.1f} KB)")
+
+    state_counts = np.bincount(state, minlength=len(state_names)).tolist()
+    index = {
+        "count": int(len(lat)),
+        "min_zoom": min_zoom,
+        "max_zoom": max_zoom,
+        "cells_per_tile": 1 << depth,
+        "bounds": [round(float(lon.min()), COORD_DIGITS), round(float(lat.min()), COORD_DIGITS),
+                   round(float(lon.max()), COORD_DIGITS), round(float(lat.max()), COORD_DIGITS)] if len(lat) else None,
+        "states": {name: count for name, count in zip(state_names, state_counts) if count},
+        "zooms": zooms,
+    }
+    _write_json(os.path.join(tmp_dir, INDEX_FILE), index)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(os.path.dirname(os.path.abspath(out_dir)), exist_ok=True)
+    os.replace(tmp_dir, out_dir)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Build static map tiles of violation clusters.")
+    parser.add_argument("inputs", nargs="*", help="COPY fixture files (.tsv) or CSV exports with a header row")
+    parser.add_argument("--generate", type=int, help="Tile this many synthetic violations instead of reading files")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--min-zoom", type=int, default=MIN_ZOOM)
+    parser.add_argument("--max-zoom", type=int, default=MAX_ZOOM)
+    parser.add_argument("--cell-depth", type=int, default=CELL_DEPTH,
+                        help="Cluster grid per tile is 2**depth cells on a side")
+    args = parser.parse_args()
+    if not args.inputs and not args.generate:
+        parser.error("pass input files or --generate")
+    if args.max_zoom + args.cell_depth > 30:
+        parser.error("max-zoom + cell-depth must be at most 30")
+
+    start = time.perf_counter()
+    if args.generate:
+        lat, lon, state, state_names = generated_points(args.generate)
+    else:
+        lat, lon, state, state_names = load_points(args.inputs)
+    print(f"[*] {len(lat):,} points with coordinates in {len(state_names)} states "
+          f"({time.perf_counter() - start:.1f}s to load)")
+
+    index = write_tiles(args.output, lat, lon, state, state_names, args.min_zoom, args.max_zoom, args.cell_depth)
+    total = sum(zoom["bytes"] for zoom in index["zooms"].values())
+    print(f"[+] {sum(zoom['tiles'] for zoom in index['zooms'].values()):,} tiles ({total / (1 << 20):,.1f} MB) "
+          f"in {time.perf_counter() - start:.1f}s -> {args.output}")
+
+if __name__ == "__main__":
+    main()